@@ -9,7 +9,6 @@ Environment Variables:
 
 import os
 import sys
-import time
 import signal
 import argparse
 from datetime import datetime, date, timedelta
@@ -22,9 +21,10 @@ import threading
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from scraper.main import KTMBShuttleScraper
+from scraper.browser_pool import BrowserPool
 from utils.config import ScraperSettings, Direction, TimeSlot
 from notifications.notifications import create_notification_sender
-from utils.logging_config import setup_logging, get_logger
+from utils.logging_config import setup_logging
 from scraper.healthcheck import run_healthcheck_server
 from notifications.healthchecks import HealthCheckPinger
 from utils.holidays import get_holidays, get_travel_dates_for_week, get_years_for_month
@@ -39,15 +39,25 @@ class KTMBMonitor:
     def __init__(self, interval_minutes: int = 30):
         self.interval_minutes = interval_minutes
         self.running = True
+        # Set on shutdown so waits between checks end immediately
+        self._stop_event = threading.Event()
+        # One Chromium for the monitor's lifetime; each search gets a new context
+        self.browser_pool = BrowserPool()
         self.notification_sender = create_notification_sender()
 
         # Set up signal handlers for graceful shutdown (only SIGTERM)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
+    def close(self) -> None:
+        """Shut down the pooled browser and write pending notification cache changes"""
+        self.browser_pool.close()
+        self.notification_sender.close()
+
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         logger.info(f"Received signal {signum}, shutting down gracefully...")
         self.running = False
+        self._stop_event.set()
         
         # If we get a second signal, force exit
         if hasattr(self, '_shutdown_requested'):
@@ -83,7 +93,7 @@ class KTMBMonitor:
         logger.info(f"Direction: {direction.value}")
         logger.info(f"Time slots: {[slot.value for slot in time_slots]}")
 
-        scraper = KTMBShuttleScraper(settings)
+        scraper = KTMBShuttleScraper(settings, browser_pool=self.browser_pool)
         result = scraper.run()
 
         return result, settings
@@ -115,7 +125,7 @@ class KTMBMonitor:
         )
         logger.info(f"Time slots: {[slot.value for slot in time_slots]}")
 
-        scraper = KTMBShuttleScraper(settings)
+        scraper = KTMBShuttleScraper(settings, browser_pool=self.browser_pool)
         result = scraper.run()
 
         return result, settings
@@ -367,11 +377,8 @@ class KTMBMonitor:
                     f"Next check: {(datetime.now() + timedelta(minutes=self.interval_minutes)).strftime('%Y-%m-%d %H:%M:%S')}"
                 )
 
-                # Sleep in smaller intervals to allow for graceful shutdown
-                for _ in range(self.interval_minutes * 60):
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                # Returns early if a shutdown signal arrives
+                self._stop_event.wait(self.interval_minutes * 60)
 
                 iteration += 1
 
@@ -394,11 +401,8 @@ class KTMBMonitor:
                 logger.error(f"Error during monitoring: {e}")
                 logger.info("Waiting 5 minutes before retrying...")
                 
-                # Sleep in smaller intervals to allow for graceful shutdown
-                for _ in range(300):  # 5 minutes = 300 seconds
-                    if not self.running:
-                        break
-                    time.sleep(1)
+                # Returns early if a shutdown signal arrives
+                self._stop_event.wait(300)  # 5 minutes
 
         logger.info("Monitoring stopped")
 
@@ -612,19 +616,13 @@ Examples:
         }
     elif args.date:
         search_type = "specific_date"
-        direction = (
-            Direction.JB_TO_SG if args.direction == "jb-to-sg" else Direction.SG_TO_JB
-        )
+        direction = Direction(args.direction)
         kwargs = {"date": args.date, "direction": direction, "time_slots": time_slots, "min_available_seats": args.min_available_seats, "max_available_seats": args.max_available_seats}
     elif args.weekends:
         if args.year is not None and args.month is not None:
             # Specific month weekends
             search_type = "weekends"
-            direction = (
-                Direction.JB_TO_SG
-                if args.direction == "jb-to-sg"
-                else Direction.SG_TO_JB
-            )
+            direction = Direction(args.direction)
             kwargs = {
                 "year": args.year,
                 "month": args.month,
@@ -640,10 +638,13 @@ Examples:
 
 
     # Run monitoring
-    if args.continuous:
-        monitor.run_continuous_monitoring(search_type, healthcheck_pinger=healthcheck_pinger, **kwargs)
-    else:
-        monitor.run_single_search(search_type, **kwargs)
+    try:
+        if args.continuous:
+            monitor.run_continuous_monitoring(search_type, healthcheck_pinger=healthcheck_pinger, **kwargs)
+        else:
+            monitor.run_single_search(search_type, **kwargs)
+    finally:
+        monitor.close()
 
 
 
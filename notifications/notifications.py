@@ -310,9 +310,17 @@ class NotificationSender:
         if notification_sent and self.cache:
             self.cache.add_to_cache(result, search_settings)
             self.cache.cleanup_expired()
+            # Persist the entry now so a crash or container stop cannot lose it
+            # and re-send the same alert on the next run
+            self.cache.flush(force=True)
 
         return notification_sent
 
+    def close(self) -> None:
+        """Write any pending notification cache changes"""
+        if self.cache:
+            self.cache.close()
+
 
 def create_notification_sender() -> NotificationSender:
     """Factory function to create notification sender with configuration"""
@@ -75,10 +75,10 @@ class BrowserManager:
         """Navigate to KTMB shuttle booking page."""
         try:
             logger.info(f"Navigating to {KTMB_CONFIG['base_url']}")
-            self.page.goto(KTMB_CONFIG["base_url"])
-
-            # Wait for page to load
-            self.page.wait_for_load_state("networkidle")
+            # The site's analytics pings keep the network busy, so waiting for
+            # networkidle tends to run out its whole timeout; callers wait for
+            # the specific elements they need instead
+            self.page.goto(KTMB_CONFIG["base_url"], wait_until="domcontentloaded")
 
             # Check if we're on the right page
             if "shuttle" not in self.page.url.lower():
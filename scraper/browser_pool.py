@@ -0,0 +1,114 @@
+"""Shared Chromium instance that lends out fresh browser contexts."""
+
+import os
+from typing import Any, Dict, Optional, Set
+
+from playwright.sync_api import sync_playwright, Browser, BrowserContext
+from utils.logging_config import get_logger
+
+# Get logger for this module
+logger = get_logger(__name__)
+
+
+def chromium_launch_kwargs() -> Dict[str, Any]:
+    """Chromium launch options, with additional flags for stability"""
+    launch_kwargs = {
+        "headless": True,
+        "args": [
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-gpu',
+            '--disable-web-security',
+            '--disable-features=VizDisplayCompositor',
+            '--memory-pressure-off',
+            '--max_old_space_size=4096'
+        ],
+    }
+    executable_path = os.getenv("PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH")
+    if executable_path:
+        launch_kwargs["executable_path"] = executable_path
+    return launch_kwargs
+
+
+class BrowserPool:
+    """
+    Launches Chromium once and hands out a new BrowserContext per search.
+
+    Creating a context takes milliseconds while launching the browser takes
+    seconds, so long-running callers such as the monitor keep one pool for
+    their whole lifetime. The browser is launched lazily on the first
+    acquire() and relaunched if it has crashed or disconnected.
+
+    Playwright's sync API is bound to the thread that started it, so a pool
+    must only be used from the thread that created it.
+    """
+
+    def __init__(self, launch_kwargs: Optional[Dict[str, Any]] = None):
+        self.launch_kwargs = launch_kwargs or chromium_launch_kwargs()
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+        self._contexts: Set[BrowserContext] = set()
+
+    def __enter__(self):
+        """Context manager entry."""
+        self._get_browser()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+    def _get_browser(self) -> Browser:
+        """Return the running browser, (re)launching it if needed"""
+        if self.browser is not None and self.browser.is_connected():
+            return self.browser
+
+        self.close()
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(**self.launch_kwargs)
+        logger.debug("Launched pooled browser")
+        return self.browser
+
+    def acquire(self, **context_kwargs) -> BrowserContext:
+        """
+        Create a new context on the shared browser
+
+        Args:
+            **context_kwargs: Passed through to Browser.new_context()
+
+        Returns:
+            A fresh BrowserContext; hand it back with release() when done
+        """
+        context = self._get_browser().new_context(**context_kwargs)
+        self._contexts.add(context)
+        return context
+
+    def release(self, context: BrowserContext) -> None:
+        """Close a context obtained from acquire()"""
+        self._contexts.discard(context)
+        try:
+            context.close()
+        except Exception as e:
+            logger.warning(f"Error closing context: {e}")
+
+    def close(self) -> None:
+        """Close any outstanding contexts, the browser and the Playwright driver"""
+        for context in list(self._contexts):
+            self.release(context)
+
+        try:
+            if self.browser:
+                self.browser.close()
+                logger.debug("Pooled browser closed")
+        except Exception as e:
+            logger.warning(f"Error closing browser: {e}")
+        finally:
+            self.browser = None
+
+        try:
+            if self.playwright:
+                self.playwright.stop()
+        except Exception as e:
+            logger.warning(f"Error stopping Playwright: {e}")
+        finally:
+            self.playwright = None
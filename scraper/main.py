@@ -1,25 +1,311 @@
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, Error as PlaywrightError
 from utils.config import (
     ScraperSettings,
     Direction,
-    DIRECTION_MAPPING,
     KTMB_CONFIG,
     TimeSlot,
-    TIME_SLOT_RANGES,
+    classify_time_slot,
+    bind_ktmb_locators,
 )
-from typing import Dict, Any, List
-import os
+from typing import Dict, Any, List, Optional
+import logging
+import re
 import time as time_module
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, time as datetime_time
-from utils.logging_config import setup_logging, LoggingConfig, get_logger
+from utils.logging_config import setup_logging
+from utils.schedule_cache import ScheduleCache
+from scraper.browser_pool import BrowserPool, chromium_launch_kwargs
+from scraper.parser import _ROW_CELLS_JS
 
 # Initialize logger with default configuration
 logger = setup_logging()
 
+_OPPOSITE_DIRECTION = {
+    Direction.JB_TO_SG: Direction.SG_TO_JB,
+    Direction.SG_TO_JB: Direction.JB_TO_SG,
+}
+
+# First run of digits in a train number, e.g. "Shuttle 78" -> "78"
+_TRAIN_NUM_RE = re.compile(r"(\d+)")
+
+# Section header keywords -> trip leg, checked in order (outbound keywords
+# first, matching the original if/elif precedence)
+_HEADER_KEYWORDS = {
+    "outbound": "out",
+    "departure": "out",
+    "sg": "out",
+    "woodlands": "out",
+    "return": "ret",
+    "jb": "ret",
+    "johor": "ret",
+}
+
+# strptime fallbacks for anything the fast path below does not understand
+_TIME_FORMATS = ("%H:%M", "%I:%M %p", "%I:%M%p")
+
+_MONTH_NAMES = (
+    "",
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+_MONTH_NAMES_BY_NUMBER = {i: name for i, name in enumerate(_MONTH_NAMES) if name}
+_MONTH_NUMBERS = {name: i for i, name in enumerate(_MONTH_NAMES) if name}
+
+# For each section header, the trimmed text plus the cell texts of the first
+# table that follows it in document order (null if none), in one DOM pass
+_SECTION_TABLES_JS = """(headerSelector) => {
+    // Body rows, or every row for tables without a tbody
+    const bodyRowCells = (table) => {
+        let rows = table.querySelectorAll('tbody > tr');
+        if (!rows.length) rows = table.querySelectorAll('tr');
+        return Array.from(rows, (row) =>
+            Array.from(
+                row.querySelectorAll('td'),
+                (cell) => cell.textContent.replace(/\\s+/g, ' ').trim()
+            ));
+    };
+    const tables = Array.from(document.querySelectorAll('table'));
+    return Array.from(document.querySelectorAll(headerSelector), (header) => {
+        const table = tables.find((t) => {
+            const pos = header.compareDocumentPosition(t);
+            return (pos & Node.DOCUMENT_POSITION_FOLLOWING)
+                && !(pos & Node.DOCUMENT_POSITION_CONTAINED_BY);
+        });
+        return {
+            header: header.innerText.trim(),
+            rows: table ? bodyRowCells(table) : null,
+        };
+    });
+}"""
+
+# True once a search has produced results, a validation error, or a redirect
+# to the results page
+_SEARCH_SETTLED_JS = """() => !!document.querySelector('#tblTrainList')
+    || !!document.querySelector('#OnwardDate-error')
+    || location.href.includes('ShuttleTrip')"""
+
+# Everything _perform_search inspects once a search has settled, in one call:
+# whether the results table exists, the visible date validation message and
+# the text of any error banners
+_SEARCH_OUTCOME_JS = """() => {
+    const validation = document.querySelector('#OnwardDate-error');
+    return {
+        hasTable: !!document.querySelector('#tblTrainList'),
+        validationError: validation && validation.getClientRects().length
+            ? validation.innerText : null,
+        errors: Array.from(
+            document.querySelectorAll('.alert, .error, .validation-error'),
+            (el) => el.innerText,
+        ),
+    };
+}"""
+
+# Text of the first visible "no results" element, or of the first message
+# found in the rendered page text, else null
+_NO_RESULTS_MESSAGE_JS = """({ selectors, texts }) => {
+    for (const selector of selectors) {
+        const el = document.querySelector(selector);
+        if (el && el.getClientRects().length) return el.innerText || selector;
+    }
+    const body = document.body ? document.body.innerText : "";
+    return texts.find((text) => body.includes(text)) || null;
+}"""
+
+_FIRST_MATCHING_SELECTOR_JS = """(selectors) =>
+    selectors.find((selector) => document.querySelector(selector) !== null) || null"""
+
+# Candidate results tables, most specific first, and the same list as one
+# selector group for a single wait
+_RESULTS_TABLE_SELECTORS = (
+    "#tblTrainList",
+    ".train-table",
+    "table",
+    ".results-table",
+    '[data-testid="train-list"]',
+)
+_RESULTS_TABLE_SELECTOR_GROUP = ", ".join(_RESULTS_TABLE_SELECTORS)
+
+# Argument for _NO_RESULTS_MESSAGE_JS (a plain dict, as evaluate() serializes
+# dicts but not other mappings)
+_NO_RESULTS_PROBE = {
+    "selectors": (".no-results", ".empty-state"),
+    "texts": ("No trains available", "No results found"),
+}
+
+# Swaps direction if requested, then sets the departure/return dates and fires
+# the change events the form's own handlers listen for
+_FILL_SEARCH_FORM_JS = """({ swap, onward, returnDate }) => {
+    if (swap) {
+        // Find the direction swap button and click it to get SG -> JB
+        const swapButton = document.querySelector('i[class*="swap"], i[class*="exchange"], i:nth-child(2)');
+        if (swapButton) {
+            swapButton.click();
+        }
+    }
+    const setDate = (id, value) => {
+        const input = document.getElementById(id);
+        input.value = value;
+        input.dispatchEvent(new Event('change', { bubbles: true }));
+    };
+    setDate('OnwardDate', onward);
+    if (returnDate) {
+        setDate('ReturnDate', returnDate);
+    }
+}"""
+
+_SEARCH_FORM_READY_JS = """({ swap, onward, returnDate }) => {
+    const value = (selector) => {
+        const el = document.querySelector(selector);
+        return el ? el.value : '';
+    };
+    return (!swap || value('#FromStationId').toUpperCase().includes('WOODLANDS'))
+        && value('#OnwardDate') === onward
+        && (!returnDate || value('#ReturnDate') === returnDate);
+}"""
+
+
+def _fast_parse_hm(s: str) -> tuple[int, int]:
+    """Parse "HH:MM" or "H:MM AM/PM" into (hour, minute) without strptime.
+
+    Raises ValueError for anything else so callers can fall back to strptime.
+    """
+    s = s.strip()
+    ampm = ""
+    if s.endswith(("AM", "PM", "am", "pm")):
+        ampm = s[-2:].upper()
+        s = s[:-2].strip()
+
+    h, sep, m = s.partition(":")
+    if not sep or len(m) != 2:
+        raise ValueError(f"Unrecognised time format: {s!r}")
+    h = int(h)
+    m = int(m)
+
+    if ampm:
+        if not 1 <= h <= 12:
+            raise ValueError(f"Hour out of range for 12-hour time: {h}")
+        if ampm == "PM" and h < 12:
+            h += 12
+        elif ampm == "AM" and h == 12:
+            h = 0
+
+    if not (0 <= h <= 23 and 0 <= m <= 59):
+        raise ValueError(f"Time out of range: {h}:{m}")
+    return h, m
+
+
+def _parse_time_str(time_str: str) -> Optional[datetime_time]:
+    """Parse a KTMB departure time, returning None if it cannot be parsed"""
+    try:
+        return datetime_time(*_fast_parse_hm(time_str))
+    except ValueError:
+        pass
+
+    for fmt in _TIME_FORMATS:
+        try:
+            return datetime.strptime(time_str.strip(), fmt).time()
+        except ValueError:
+            continue
+    return None
+
+
+def _playwright_error_summary(error: PlaywrightError) -> str:
+    """First line of a Playwright error, without the call log appended to it"""
+    return (error.message or "").split("\n", 1)[0]
+
+
+def _extract_row_cells(root, selector: str) -> List[List[str]]:
+    """Return the cell texts of each row matching selector under a page or element"""
+    return root.eval_on_selector_all(selector, _ROW_CELLS_JS)
+
+
+def _extract_table_rows(root, table_selector: str = "") -> List[List[str]]:
+    """Return the cell texts of the body rows of the matching tables
+
+    Only falls back to every <tr> when "tbody > tr" matches nothing, so header
+    rows are skipped when the table has a tbody. With no table_selector, root
+    itself is the table.
+    """
+    prefix = f"{table_selector} " if table_selector else ""
+    rows = _extract_row_cells(root, f"{prefix}tbody > tr")
+    if not rows:
+        rows = _extract_row_cells(root, f"{prefix}tr")
+    return rows
+
+
+# Every search gets a fresh context with these options, whether it comes from
+# a BrowserPool or a browser launched for the run
+_CONTEXT_KWARGS = {
+    "viewport": {'width': 1920, 'height': 1080},
+    "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+}
+
 
 class KTMBShuttleScraper:
-    def __init__(self, settings: ScraperSettings):
+    def __init__(
+        self,
+        settings: ScraperSettings,
+        reuse_browser: bool = False,
+        parallel_round_trip: bool = False,
+        browser_pool: Optional[BrowserPool] = None,
+    ):
+        """
+        Args:
+            settings: Search settings
+            reuse_browser: Keep one Chromium instance open across run() calls
+                and only create a new context per run. Also enabled by using
+                the scraper as a context manager; call close() when done.
+            parallel_round_trip: For round-trip settings, run the outbound and
+                return legs as two one-way searches in parallel threads
+                (each with its own browser, as Playwright's sync API is
+                bound to the thread that started it) and merge the results.
+                The round trip fails if either leg fails. Off by default, so
+                both legs are searched on one page. Ignored when the browser
+                is reused, so the shared browser serves both legs in sequence
+                instead of two extra browsers being launched.
+            browser_pool: Take each run's context from this pool instead of
+                launching a browser. The pool is owned by the caller and must
+                be used from the thread that created it, so round trips are
+                searched on one page rather than in parallel threads.
+        """
         self.settings = settings
+        self.reuse_browser = reuse_browser
+        self.parallel_round_trip = parallel_round_trip
+        self._browser_pool = browser_pool
+        self._pw = None
+        self._browser = None
+        self._schedule_cache = (
+            ScheduleCache(ttl_seconds=settings.schedule_cache_ttl_seconds)
+            if settings.schedule_cache_ttl_seconds
+            else None
+        )
+        self._desired_slots_fs = frozenset(settings.desired_time_slots or ())
+        self._filter_enabled = bool(self._desired_slots_fs)
+
+        # These never change for the lifetime of the scraper, so format them once
+        self._direction_value = settings.direction.value
+        self._depart_date_str = settings.depart_date.strftime("%Y-%m-%d")
+        self._return_date_str = (
+            settings.return_date.strftime("%Y-%m-%d") if settings.return_date else None
+        )
+        self._search_criteria_template = {
+            "direction": self._direction_value,
+            "depart_date": self._depart_date_str,
+            "return_date": self._return_date_str,
+            "passengers": settings.total_pax,
+            "min_seats": settings.min_available_seats,
+        }
         logger.info(
             f"Initialized KTMB Shuttle Scraper with settings: direction={settings.direction}, "
             f"depart_date={settings.depart_date}, "
@@ -27,70 +313,87 @@ class KTMBShuttleScraper:
             f"passengers={settings.total_pax}"
         )
 
-    def _get_time_slot(self, time_str: str) -> TimeSlot:
-        """Determine which time slot a given time falls into"""
-        try:
-            # Parse time string (e.g., "19:00" or "7:00 PM")
-            from datetime import datetime
+    def __enter__(self):
+        """Context manager entry: launch the shared browser once"""
+        self._get_shared_browser()
+        return self
 
-            # Try different time formats
-            time_formats = ["%H:%M", "%I:%M %p", "%I:%M%p"]
-            parsed_time = None
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
 
-            for fmt in time_formats:
-                try:
-                    parsed_time = datetime.strptime(time_str.strip(), fmt).time()
-                    break
-                except ValueError:
-                    continue
+    def _get_shared_browser(self):
+        """Return the long-lived browser, (re)launching it if needed"""
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
 
-            if not parsed_time:
-                # Default to evening if we can't parse the time
-                logger.debug(
-                    f"Could not parse time '{time_str}', defaulting to evening slot"
-                )
-                return TimeSlot.EVENING
-
-            # Check which time slot this time falls into
-            for slot, (start_time, end_time) in TIME_SLOT_RANGES.items():
-                if slot == TimeSlot.NIGHT:
-                    # Night slot spans midnight, so check if time is after 22:00 or before 05:00
-                    if parsed_time >= start_time or parsed_time <= datetime_time(4, 59):
-                        logger.debug(f"Time '{time_str}' falls into {slot} slot")
-                        return slot
-                else:
-                    # Regular time slots
-                    if start_time <= parsed_time <= end_time:
-                        logger.debug(f"Time '{time_str}' falls into {slot} slot")
-                        return slot
+        self.close()
+        self._pw = sync_playwright().start()
+        self._browser = self._pw.chromium.launch(**chromium_launch_kwargs())
+        logger.debug("Launched shared browser")
+        return self._browser
 
-            # Default to evening if no match found
-            logger.debug(
-                f"Time '{time_str}' didn't match any slot, defaulting to evening"
-            )
-            return TimeSlot.EVENING
+    def close(self) -> None:
+        """Close the shared browser and Playwright driver, if running"""
+        try:
+            if self._browser:
+                self._browser.close()
+                logger.debug("Browser closed successfully")
+        except Exception as e:
+            logger.warning(f"Error closing browser: {e}")
+        finally:
+            self._browser = None
 
+        try:
+            if self._pw:
+                self._pw.stop()
         except Exception as e:
-            logger.error(f"Error parsing time '{time_str}': {e}")
-            return TimeSlot.EVENING
+            logger.warning(f"Error stopping Playwright: {e}")
+        finally:
+            self._pw = None
+
+    def _get_time_slot(self, time_str: str) -> TimeSlot:
+        """Determine which time slot a given time falls into"""
+        # Parse time string (e.g., "19:00" or "7:00 PM")
+        parsed_time = _parse_time_str(time_str)
+        if parsed_time is None:
+            logger.debug("Could not parse time '%s', defaulting to evening slot", time_str)
+        return classify_time_slot(parsed_time)
 
     def _is_train_in_desired_time_slots(self, departure_time: str) -> bool:
         """Check if a train's departure time falls within desired time slots"""
+        # If no time slots specified, accept all trains
+        return (
+            not self._filter_enabled
+            or self._get_time_slot(departure_time) in self._desired_slots_fs
+        )
+
+    def run(self, force_rescrape: bool = False) -> Dict[str, Any]:
+        """
+        Args:
+            force_rescrape: Scrape even if the schedule cache holds a fresh
+                result for these settings (the new result is still cached)
+        """
+        cache = self._schedule_cache
+        if cache is not None and not force_rescrape:
+            cached = cache.get(self.settings)
+            if cached is not None:
+                return cached
+
+        result = self._run_uncached()
+        if cache is not None and result.get("success", False):
+            cache.set(self.settings, result)
+        return result
+
+    def _run_uncached(self) -> Dict[str, Any]:
         if (
-            not self.settings.desired_time_slots
-            or len(self.settings.desired_time_slots) == 0
+            self.settings.return_date
+            and self.parallel_round_trip
+            and self._browser_pool is None
+            and not (self.reuse_browser or self._browser)
         ):
-            logger.debug("No time slots specified, accepting all trains")
-            return True  # If no time slots specified, accept all trains
+            return self._run_round_trip_parallel()
 
-        train_time_slot = self._get_time_slot(departure_time)
-        is_desired = train_time_slot in self.settings.desired_time_slots
-        logger.debug(
-            f"Train departure time '{departure_time}' slot '{train_time_slot}' is desired: {is_desired}"
-        )
-        return is_desired
-
-    def run(self) -> Dict[str, Any]:
         logger.debug("Starting KTMB Shuttle scraping process")
         max_retries = 3
         retry_delay = 5  # seconds
@@ -108,89 +411,87 @@ class KTMBShuttleScraper:
                     time_module.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
 
+    def _run_round_trip_parallel(self) -> Dict[str, Any]:
+        """Search both legs of a round trip concurrently and merge the results"""
+        logger.debug("Starting parallel round-trip scraping process")
+        # The merged round-trip result is cached by this scraper, not per leg
+        outbound_settings = self.settings.model_copy(
+            update={"return_date": None, "schedule_cache_ttl_seconds": 0}
+        )
+        return_settings = self.settings.model_copy(
+            update={
+                "direction": _OPPOSITE_DIRECTION[self.settings.direction],
+                "depart_date": self.settings.return_date,
+                "return_date": None,
+                "schedule_cache_ttl_seconds": 0,
+            }
+        )
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            outbound_future = executor.submit(
+                KTMBShuttleScraper(outbound_settings).run
+            )
+            return_future = executor.submit(KTMBShuttleScraper(return_settings).run)
+            outbound_result = outbound_future.result()
+            return_result = return_future.result()
+
+        return self._merge_round_trip_results(outbound_result, return_result)
+
+    def _merge_round_trip_results(
+        self, outbound_result: Dict[str, Any], return_result: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Combine two one-way results into the round-trip result format"""
+        for leg, result in (("Outbound", outbound_result), ("Return", return_result)):
+            if not result.get("success", False):
+                return {
+                    "success": False,
+                    "error": f"{leg} search failed: {result.get('error', 'Unknown error')}",
+                    "available_trains": [],
+                    "return_trains": [],
+                    "total_available": 0,
+                }
+
+        filtered_outbound = outbound_result.get("available_trains", [])
+        filtered_return = return_result.get("available_trains", [])
+
+        logger.info(
+            f"Round-trip results: {len(filtered_outbound)} outbound, {len(filtered_return)} return trains"
+        )
+
+        return {
+            "success": True,
+            "available_trains": filtered_outbound,
+            "return_trains": filtered_return,
+            "total_available": len(filtered_outbound) + len(filtered_return),
+            "search_criteria": {**self._search_criteria_template},
+            "scraped_at": datetime.now().isoformat(),
+        }
+
     def _run_with_retry(self, attempt: int, max_retries: int) -> Dict[str, Any]:
         """Run the scraper with retry logic"""
         logger.debug(f"Starting scraping attempt {attempt + 1}/{max_retries}")
         
         try:
-            with sync_playwright() as p:
-                browser = None
-                context = None
-                page = None
-                
+            if self._browser_pool is not None:
+                context = self._browser_pool.acquire(**_CONTEXT_KWARGS)
                 try:
-                    # Launch browser with additional options for stability
-                    launch_kwargs = {
-                        "headless": True,
-                        "args": [
-                            '--no-sandbox',
-                            '--disable-dev-shm-usage',
-                            '--disable-gpu',
-                            '--disable-web-security',
-                            '--disable-features=VizDisplayCompositor',
-                            '--memory-pressure-off',
-                            '--max_old_space_size=4096'
-                        ],
-                    }
-                    executable_path = os.getenv("PLAYWRIGHT_CHROMIUM_EXECUTABLE_PATH")
-                    if executable_path:
-                        launch_kwargs["executable_path"] = executable_path
-                    browser = p.chromium.launch(**launch_kwargs)
-
-                    # Create new context with increased timeout
-                    context = browser.new_context(
-                        viewport={'width': 1920, 'height': 1080},
-                        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-                    )
-                    page = context.new_page()
-                    
-                    # Set longer timeouts
-                    page.set_default_timeout(60000)  # 60 seconds
-                    page.set_default_navigation_timeout(60000)  # 60 seconds
-
-                    # Navigate to the KTMB Shuttle page with retry logic
-                    logger.debug("Navigating to KTMB Shuttle page")
-                    self._navigate_with_retry(page, "https://shuttleonline.ktmb.com.my/Home/Shuttle")
-                    page.wait_for_load_state("networkidle", timeout=30000)
-
-                    # Handle direction selection
-                    self._select_direction(page)
-
-                    # Handle date selection
-                    self._select_departure_date(page)
-
-                    # Handle return date if specified
-                    if self.settings.return_date:
-                        self._select_return_date(page)
+                    return self._scrape_in_context(context)
+                finally:
+                    self._browser_pool.release(context)
 
-                    # Select number of passengers
-                    self._select_passengers(page)
+            if self.reuse_browser or self._browser:
+                # Long-lived browser: only a fresh context is created per run
+                return self._scrape_with_browser(self._get_shared_browser())
 
-                    # Perform search
-                    self._perform_search(page)
+            with sync_playwright() as p:
+                browser = None
 
-                    # Parse results
-                    results = self._parse_results(page)
-                    logger.info("Scraping process completed successfully")
-                    return results
+                try:
+                    browser = p.chromium.launch(**chromium_launch_kwargs())
+                    return self._scrape_with_browser(browser)
 
                 finally:
-                    # Always cleanup browser resources in reverse order of creation
                     # MUST be inside the 'with' block so event loop is still active
-                    try:
-                        if page:
-                            page.close()
-                            logger.debug("Page closed successfully")
-                    except Exception as e:
-                        logger.warning(f"Error closing page: {e}")
-                    
-                    try:
-                        if context:
-                            context.close()
-                            logger.debug("Context closed successfully")
-                    except Exception as e:
-                        logger.warning(f"Error closing context: {e}")
-                    
                     try:
                         if browser:
                             browser.close()
@@ -202,6 +503,59 @@ class KTMBShuttleScraper:
             logger.error(f"Scraping process failed: {e}", exc_info=True)
             raise e  # Re-raise to trigger retry logic
 
+    def _scrape_with_browser(self, browser) -> Dict[str, Any]:
+        """Run one search in a fresh context on the given browser"""
+        context = browser.new_context(**_CONTEXT_KWARGS)
+        try:
+            return self._scrape_in_context(context)
+        finally:
+            try:
+                context.close()
+                logger.debug("Context closed successfully")
+            except Exception as e:
+                logger.warning(f"Error closing context: {e}")
+
+    def _scrape_in_context(self, context) -> Dict[str, Any]:
+        """Run one search on a new page in the given context"""
+        page = None
+
+        try:
+            page = context.new_page()
+            
+            # Set longer timeouts
+            page.set_default_timeout(60000)  # 60 seconds
+            page.set_default_navigation_timeout(60000)  # 60 seconds
+
+            # Navigate to the KTMB Shuttle page with retry logic
+            logger.debug("Navigating to KTMB Shuttle page")
+            self._navigate_with_retry(page, KTMB_CONFIG["base_url"])
+            locators = bind_ktmb_locators(page)
+            # The form is usable as soon as the date input exists; waiting for
+            # networkidle stalls on the site's analytics pings
+            locators["depart_date"].wait_for(state="attached", timeout=10000)
+
+            # Handle direction, departure date and return date selection
+            self._fill_search_form(page)
+
+            # Select number of passengers
+            self._select_passengers(page)
+
+            # Perform search
+            self._perform_search(page, locators["search_button"])
+
+            # Parse results
+            results = self._parse_results(page)
+            logger.info("Scraping process completed successfully")
+            return results
+
+        finally:
+            # The caller closes the context once the page is gone
+            try:
+                if page:
+                    page.close()
+                    logger.debug("Page closed successfully")
+            except Exception as e:
+                logger.warning(f"Error closing page: {e}")
 
     def _navigate_with_retry(self, page, url: str, max_retries: int = 3) -> None:
         """Navigate to URL with retry logic for timeout issues"""
@@ -211,119 +565,65 @@ class KTMBShuttleScraper:
                 page.goto(url, wait_until="load", timeout=60000)
                 logger.debug("Navigation successful")
                 return
-            except Exception as e:
+            except PlaywrightError as e:
                 if attempt == max_retries - 1:
                     logger.error(f"All navigation attempts failed: {e}")
                     raise e
                 else:
-                    logger.warning(f"Navigation attempt {attempt + 1} failed: {e}. Retrying...")
+                    logger.warning(
+                        "Navigation attempt %d failed: %s. Retrying...",
+                        attempt + 1,
+                        _playwright_error_summary(e),
+                    )
                     time_module.sleep(2)  # Short delay before retry
 
-    def _select_direction(self, page):
-        """Handle direction selection using JavaScript"""
+    def _fill_search_form(self, page):
+        """Set direction, departure date and return date in a single JS call"""
         try:
-            # Use JavaScript to set the direction directly
-            if self.settings.direction == Direction.SG_TO_JB:
-                # Set origin to Woodlands CIQ and destination to JB Sentral
-                page.evaluate(
-                    """
-                    // Find the direction swap button and click it to get SG -> JB
-                    const swapButton = document.querySelector('i[class*="swap"], i[class*="exchange"], i:nth-child(2)');
-                    if (swapButton) {
-                        swapButton.click();
-                    }
-                """
+            form_values = {
+                "swap": self.settings.direction == Direction.SG_TO_JB,
+                # "01 Aug 2025" format
+                "onward": self.settings.depart_date.strftime("%d %b %Y"),
+                "returnDate": (
+                    self.settings.return_date.strftime("%d %b %Y")
+                    if self.settings.return_date
+                    else None
+                ),
+            }
+            logger.debug(f"Filling search form with: {form_values}")
+
+            page.evaluate(_FILL_SEARCH_FORM_JS, form_values)
+
+            # Wait until every field holds the value we set
+            try:
+                page.wait_for_function(
+                    _SEARCH_FORM_READY_JS, arg=form_values, timeout=5000
                 )
-                page.wait_for_timeout(1000)
+            except Exception as e:
+                logger.warning(f"Search form did not settle to expected values: {e}")
+
+            if form_values["swap"]:
                 logger.debug("Direction set to SG -> JB (Woodlands CIQ -> JB Sentral)")
             else:
                 # Default is JB -> SG, so no need to swap
                 logger.debug("Direction set to JB -> SG (JB Sentral -> Woodlands CIQ)")
+            logger.debug(f"Departure date set successfully to: {form_values['onward']}")
+            if form_values["returnDate"]:
+                logger.debug(
+                    f"Return date set successfully to: {form_values['returnDate']}"
+                )
 
         except Exception as e:
-            logger.error(f"Error selecting direction: {e}", exc_info=True)
-
-    def _select_departure_date(self, page):
-        """Handle departure date selection using JavaScript"""
-        try:
-            # Use JavaScript to set the date directly - this works reliably
-            date_str = self.settings.depart_date.strftime(
-                "%d %b %Y"
-            )  # "01 Aug 2025" format
-            logger.debug(f"Setting departure date to: {date_str}")
-
-            page.evaluate(
-                f"""
-                document.querySelector('input[name="OnwardDate"]').value = '{date_str}';
-                document.querySelector('input[name="OnwardDate"]').dispatchEvent(new Event('change', {{ bubbles: true }}));
-            """
-            )
-            page.wait_for_timeout(500)
-
-            logger.debug(f"Departure date set successfully to: {date_str}")
-
-        except Exception as e:
-            logger.error(f"Error selecting departure date: {e}", exc_info=True)
+            logger.error(f"Error filling search form: {e}", exc_info=True)
             raise e
 
     def _get_month_name(self, month_number):
         """Convert month number to month name"""
-        months = {
-            1: "January",
-            2: "February",
-            3: "March",
-            4: "April",
-            5: "May",
-            6: "June",
-            7: "July",
-            8: "August",
-            9: "September",
-            10: "October",
-            11: "November",
-            12: "December",
-        }
-        return months.get(month_number, "January")
+        return _MONTH_NAMES_BY_NUMBER.get(month_number, "January")
 
     def _get_month_number(self, month_name):
         """Convert month name to month number"""
-        months = {
-            "January": 1,
-            "February": 2,
-            "March": 3,
-            "April": 4,
-            "May": 5,
-            "June": 6,
-            "July": 7,
-            "August": 8,
-            "September": 9,
-            "October": 10,
-            "November": 11,
-            "December": 12,
-        }
-        return months.get(month_name, 1)
-
-    def _select_return_date(self, page):
-        """Handle return date selection if specified"""
-        try:
-            if self.settings.return_date:
-                # Use JavaScript to set the return date directly - similar to departure date
-                return_date_str = self.settings.return_date.strftime(
-                    "%d %b %Y"
-                )  # "10 Aug 2025" format
-                logger.debug(f"Setting return date to: {return_date_str}")
-
-                page.evaluate(
-                    f"""
-                    document.querySelector('input[name="ReturnDate"]').value = '{return_date_str}';
-                    document.querySelector('input[name="ReturnDate"]').dispatchEvent(new Event('change', {{ bubbles: true }}));
-                """
-                )
-                page.wait_for_timeout(500)
-
-                logger.debug(f"Return date set successfully to: {return_date_str}")
-
-        except Exception as e:
-            logger.error(f"Error selecting return date: {e}", exc_info=True)
+        return _MONTH_NUMBERS.get(month_name, 1)
 
     def _select_passengers(self, page):
         """Handle passenger selection"""
@@ -341,16 +641,22 @@ class KTMBShuttleScraper:
         except Exception as e:
             logger.error(f"Error selecting passengers: {e}", exc_info=True)
 
-    def _perform_search(self, page):
+    def _perform_search(self, page, search_button=None):
         """Perform the search and wait for results"""
         try:
             # Click the search button
-            search_button = page.get_by_role("button", name="SEARCH")
+            # By id rather than by role, which has to scan the accessibility tree
+            if search_button is None:
+                search_button = page.locator(KTMB_CONFIG["selectors"]["search_button"])
             search_button.click()
             logger.debug("Search button clicked")
 
-            # Wait a moment for the search to process (reduced timeout)
-            page.wait_for_timeout(1000)
+            # Poll in the browser until the search has visibly finished one way or
+            # another, rather than sleeping for fixed intervals
+            try:
+                page.wait_for_function(_SEARCH_SETTLED_JS, timeout=10000)
+            except Exception as e:
+                logger.debug(f"Search did not settle before timeout: {e}")
 
             # Check current URL to see if we were redirected
             current_url = page.url
@@ -361,47 +667,36 @@ class KTMBShuttleScraper:
                 logger.debug("Successfully redirected to results page")
                 return
 
-            # Check for various possible outcomes on the search page
-            try:
-                # Wait for results table to appear (faster timeout)
-                page.wait_for_selector("#tblTrainList", timeout=5000)
+            outcome = page.evaluate(_SEARCH_OUTCOME_JS)
+            if outcome["hasTable"]:
                 logger.debug("Search completed successfully - results found")
-            except:
-                logger.warning("Results table not found, checking for errors...")
+                return
 
-                # Check for validation error - use a more specific selector
-                try:
-                    error_element = page.locator("#OnwardDate-error")
-                    if error_element.is_visible():
-                        error_text = error_element.inner_text()
-                        logger.error(f"Found validation error: {error_text}")
-                        if "Please select departing date" in error_text:
-                            raise Exception(
-                                "Validation error: Please select departing date"
-                            )
-                except Exception as error_check:
-                    logger.debug(f"Error check failed: {error_check}")
+            logger.warning("Results table not found, checking for errors...")
 
-                # Check for other error messages
-                try:
-                    # Look for any error messages on the page
-                    error_messages = page.locator(".alert, .error, .validation-error")
-                    error_count = error_messages.count()
-                    for i in range(error_count):
-                        error_text = error_messages.nth(i).inner_text()
-                        logger.error(f"Found error message: {error_text}")
-                except:
-                    pass
-
-                # Take a screenshot for debugging
+            # Check for validation error - use a more specific selector
+            try:
+                error_text = outcome["validationError"]
+                if error_text is not None:
+                    logger.error(f"Found validation error: {error_text}")
+                    if "Please select departing date" in error_text:
+                        raise Exception(
+                            "Validation error: Please select departing date"
+                        )
+            except Exception as error_check:
+                logger.debug(f"Error check failed: {error_check}")
+
+            # Check for other error messages
+            for error_text in outcome["errors"]:
+                logger.error(f"Found error message: {error_text}")
+
+            # Take a screenshot for debugging
+            if self.settings.debug_screenshots:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 screenshot_path = f"output/debug_screenshot_{timestamp}.png"
                 page.screenshot(path=screenshot_path)
                 logger.debug(f"Screenshot saved as {screenshot_path}")
 
-                # Wait a bit more for results
-                page.wait_for_timeout(3000)
-
         except Exception as e:
             logger.error(f"Error during search: {e}", exc_info=True)
             raise e
@@ -436,71 +731,50 @@ class KTMBShuttleScraper:
 
     def _parse_single_direction_results(self, page) -> Dict[str, Any]:
         """Parse single direction search results"""
-        # Try different selectors for the results table
-        table_selectors = [
-            "#tblTrainList",
-            ".train-table",
-            "table",
-            ".results-table",
-            '[data-testid="train-list"]',
-        ]
-
-        table_found = False
+        # One wait on the selector list resolves as soon as any of them matches,
+        # so a page without a table costs a single timeout instead of five
         selector = None
-        for sel in table_selectors:
-            try:
-                page.wait_for_selector(sel, timeout=5000)
-                logger.debug(f"Found results table with selector: {sel}")
-                table_found = True
-                selector = sel
-                break
-            except:
-                continue
-
-        if not table_found:
-            # Take a screenshot to see what's on the page
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            results_screenshot_path = f"output/results_page_screenshot_{timestamp}.png"
-            page.screenshot(path=results_screenshot_path)
-            logger.warning(
-                f"No results table found, screenshot saved as {results_screenshot_path}"
+        try:
+            page.wait_for_selector(_RESULTS_TABLE_SELECTOR_GROUP, timeout=5000)
+            # Prefer the most specific selector that matched
+            selector = page.evaluate(
+                _FIRST_MATCHING_SELECTOR_JS, _RESULTS_TABLE_SELECTORS
             )
+            logger.debug("Found results table with selector: %s", selector)
+        except Exception:
+            pass
 
-            # Check if there's a "no results" message
-            no_results_selectors = [
-                'text="No trains available"',
-                'text="No results found"',
-                ".no-results",
-                ".empty-state",
-            ]
+        if not selector:
+            # Take a screenshot to see what's on the page
+            if self.settings.debug_screenshots:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                results_screenshot_path = (
+                    f"output/results_page_screenshot_{timestamp}.png"
+                )
+                page.screenshot(path=results_screenshot_path)
+                logger.warning(
+                    f"No results table found, screenshot saved as {results_screenshot_path}"
+                )
+            else:
+                logger.warning("No results table found")
 
-            for no_result_selector in no_results_selectors:
-                try:
-                    if page.locator(no_result_selector).is_visible():
-                        logger.info("No trains available for the selected criteria")
-                        return {
-                            "success": True,
-                            "available_trains": [],
-                            "return_trains": [],
-                            "total_available": 0,
-                            "message": "No trains available for the selected criteria",
-                            "search_criteria": {
-                                "direction": self.settings.direction.value,
-                                "depart_date": self.settings.depart_date.strftime(
-                                    "%Y-%m-%d"
-                                ),
-                                "return_date": (
-                                    self.settings.return_date.strftime("%Y-%m-%d")
-                                    if self.settings.return_date
-                                    else None
-                                ),
-                                "passengers": self.settings.total_pax,
-                                "min_seats": self.settings.min_available_seats,
-                            },
-                            "scraped_at": datetime.now().isoformat(),
-                        }
-                except:
-                    continue
+            # Check if there's a "no results" message (all candidates in one call)
+            try:
+                no_results = page.evaluate(_NO_RESULTS_MESSAGE_JS, _NO_RESULTS_PROBE)
+            except Exception:
+                no_results = None
+
+            if no_results:
+                logger.info("No trains available for the selected criteria")
+                return {
+                    "success": True,
+                    "available_trains": [],
+                    "return_trains": [],
+                    "total_available": 0,
+                    "message": "No trains available for the selected criteria",
+                    "search_criteria": {**self._search_criteria_template},
+                    "scraped_at": datetime.now().isoformat(),
+                }
 
             return {
                 "success": False,
@@ -511,13 +785,20 @@ class KTMBShuttleScraper:
             }
 
         # Get all train rows
-        rows = page.query_selector_all(f"{selector} tbody tr, {selector} tr")
-        logger.debug(f"Found {len(rows)} train rows to parse")
+        rows = _extract_table_rows(page, selector)
+        logger.debug("Found %s train rows to parse", len(rows))
 
         available_trains = []
+        append = available_trains.append
+
+        # Read settings once, and only build log messages when they will be emitted
+        min_seats = self.settings.min_available_seats
+        max_seats = self.settings.max_available_seats
+        in_desired_slots = self._is_train_in_desired_time_slots
+        direction_value = self._direction_value
+        debug = logger.isEnabledFor(logging.DEBUG)
 
-        for row in rows:
-            cells = row.query_selector_all("td")
+        for cells in rows:
             if not cells or len(cells) < 3:
                 continue
 
@@ -525,63 +806,82 @@ class KTMBShuttleScraper:
                 # Extract train information - try different column layouts
                 if len(cells) >= 5:
                     # Standard layout: train number, departure, arrival, duration, seats
-                    train_number = cells[0].inner_text().strip()
-                    departure_time = cells[1].inner_text().strip()
-                    arrival_time = cells[2].inner_text().strip()
-                    available_seats = int(cells[4].inner_text().strip())
+                    train_number = cells[0]
+                    departure_time = cells[1]
+                    arrival_time = cells[2]
+                    seats_text = cells[4]
                 elif len(cells) >= 4:
                     # Alternative layout: train number, departure, arrival, seats
-                    train_number = cells[0].inner_text().strip()
-                    departure_time = cells[1].inner_text().strip()
-                    arrival_time = cells[2].inner_text().strip()
-                    available_seats = int(cells[3].inner_text().strip())
+                    train_number = cells[0]
+                    departure_time = cells[1]
+                    arrival_time = cells[2]
+                    seats_text = cells[3]
                 else:
                     # Minimal layout: departure, arrival, seats
                     train_number = f"Train {len(available_trains) + 1}"
-                    departure_time = cells[0].inner_text().strip()
-                    arrival_time = cells[1].inner_text().strip()
-                    available_seats = int(cells[2].inner_text().strip())
-
-                logger.debug(
-                    f"Parsed train: {train_number}, {departure_time}-{arrival_time}, {available_seats} seats"
-                )
+                    departure_time = cells[0]
+                    arrival_time = cells[1]
+                    seats_text = cells[2]
+
+                # Time-slot check first: it rejects most rows and is cheaper than
+                # parsing the seat count
+                if not in_desired_slots(departure_time):
+                    if debug:
+                        logger.debug("Train %s not in desired time slots", train_number)
+                    continue
 
-                # Check if this train meets our criteria
-                seats_in_range = available_seats >= self.settings.min_available_seats
-                if self.settings.max_available_seats is not None:
-                    seats_in_range = seats_in_range and available_seats <= self.settings.max_available_seats
-                
-                if seats_in_range:
-                    # Check if train is in desired time slots
-                    if self._is_train_in_desired_time_slots(departure_time):
-                        train_info = {
-                            "train_number": train_number,
-                            "departure_time": departure_time,
-                            "arrival_time": arrival_time,
-                            "available_seats": available_seats,
-                            "direction": self.settings.direction.value,
-                        }
-                        available_trains.append(train_info)
-                        logger.debug(f"Added train to available list: {train_number}")
-                    else:
-                        logger.debug(f"Train {train_number} not in desired time slots")
-                else:
-                    if available_seats < self.settings.min_available_seats:
-                        logger.debug(
-                            f"Train {train_number} has insufficient seats ({available_seats} < {self.settings.min_available_seats})"
-                        )
-                    elif self.settings.max_available_seats is not None and available_seats > self.settings.max_available_seats:
-                        logger.debug(
-                            f"Train {train_number} has too many seats ({available_seats} > {self.settings.max_available_seats}), indicating non-popular period"
-                        )
+                available_seats = int(seats_text)
 
             except (ValueError, IndexError) as e:
                 # Skip rows that can't be parsed
-                logger.warning(f"Skipping row due to parsing error: {e}")
+                logger.warning("Skipping row due to parsing error: %s", e)
                 continue
 
+            if debug:
+                logger.debug(
+                    "Parsed train: %s, %s-%s, %s seats",
+                    train_number,
+                    departure_time,
+                    arrival_time,
+                    available_seats,
+                )
+
+            # Check if this train meets our criteria
+            if available_seats < min_seats:
+                if debug:
+                    logger.debug(
+                        "Train %s has insufficient seats (%s < %s)",
+                        train_number,
+                        available_seats,
+                        min_seats,
+                    )
+                continue
+            if max_seats is not None and available_seats > max_seats:
+                if debug:
+                    logger.debug(
+                        "Train %s has too many seats (%s > %s), indicating non-popular period",
+                        train_number,
+                        available_seats,
+                        max_seats,
+                    )
+                continue
+
+            append(
+                {
+                    "train_number": train_number,
+                    "departure_time": departure_time,
+                    "arrival_time": arrival_time,
+                    "available_seats": available_seats,
+                    "direction": direction_value,
+                }
+            )
+            if debug:
+                logger.debug("Added train to available list: %s", train_number)
+
         logger.debug(
-            f"Successfully parsed {len(available_trains)} available trains out of {len(rows)} total trains"
+            "Successfully parsed %s available trains out of %s total trains",
+            len(available_trains),
+            len(rows),
         )
 
         return {
@@ -589,17 +889,7 @@ class KTMBShuttleScraper:
             "available_trains": available_trains,
             "return_trains": [],
             "total_available": len(available_trains),
-            "search_criteria": {
-                "direction": self.settings.direction.value,
-                "depart_date": self.settings.depart_date.strftime("%Y-%m-%d"),
-                "return_date": (
-                    self.settings.return_date.strftime("%Y-%m-%d")
-                    if self.settings.return_date
-                    else None
-                ),
-                "passengers": self.settings.total_pax,
-                "min_seats": self.settings.min_available_seats,
-            },
+            "search_criteria": {**self._search_criteria_template},
             "scraped_at": datetime.now().isoformat(),
         }
 
@@ -614,66 +904,78 @@ class KTMBShuttleScraper:
         outbound_trains = []
         return_trains = []
 
-        # First, let's see what's actually on the page
-        page_text = page.inner_text("body").lower()
-        logger.debug(f"Page contains text: {page_text[:500]}...")  # First 500 chars
+        # First, let's see what's actually on the page (only fetch the first
+        # 500 chars, and only when someone will read them)
+        if logger.isEnabledFor(logging.DEBUG):
+            page_text = page.evaluate(
+                "() => document.body.innerText.slice(0, 500).toLowerCase()"
+            )
+            logger.debug("Page contains text: %s...", page_text)
 
-        # Look for section headers that might indicate outbound vs return
-        section_headers = page.query_selector_all(
-            "h2, h3, .section-header, .trip-header, .panel-title, .card-title"
+        # Look for section headers that might indicate outbound vs return,
+        # together with the rows of the first table following each header
+        sections = page.evaluate(
+            _SECTION_TABLES_JS,
+            "h2, h3, .section-header, .trip-header, .panel-title, .card-title",
         )
 
-        if section_headers:
-            logger.debug(f"Found {len(section_headers)} section headers")
-            for i, header in enumerate(section_headers):
-                header_text = header.inner_text().strip()
-                logger.debug(f"Section header {i+1}: '{header_text}'")
+        if sections:
+            logger.debug("Found %s section headers", len(sections))
+            for i, section in enumerate(sections):
+                header_text = section["header"]
+                logger.debug("Section header %s: '%s'", i + 1, header_text)
 
-                # Look for the next table after this header
-                next_table = header.query_selector("xpath=following::table[1]")
-                if next_table:
-                    trains = self._parse_table_rows(next_table)
+                # Rows of the next table after this header, if there is one
+                if section["rows"] is not None:
+                    trains = self._parse_row_cells(section["rows"])
                     logger.debug(
-                        f"Found {len(trains)} trains in section '{header_text}'"
+                        "Found %s trains in section '%s'",
+                        len(trains),
+                        header_text,
+                    )
+                    header_lower = header_text.lower()
+                    tag = next(
+                        (t for kw, t in _HEADER_KEYWORDS.items() if kw in header_lower),
+                        None,
                     )
-                    if (
-                        "outbound" in header_text.lower()
-                        or "departure" in header_text.lower()
-                        or "sg" in header_text.lower()
-                        or "woodlands" in header_text.lower()
-                    ):
+                    if tag == "out":
                         outbound_trains.extend(trains)
                         logger.debug(
-                            f"Added {len(trains)} outbound trains from section: {header_text}"
+                            "Added %s outbound trains from section: %s",
+                            len(trains),
+                            header_text,
                         )
-                    elif (
-                        "return" in header_text.lower()
-                        or "jb" in header_text.lower()
-                        or "johor" in header_text.lower()
-                    ):
+                    elif tag == "ret":
                         return_trains.extend(trains)
                         logger.debug(
-                            f"Added {len(trains)} return trains from section: {header_text}"
+                            "Added %s return trains from section: %s",
+                            len(trains),
+                            header_text,
                         )
                     else:
                         logger.debug(
-                            f"Unclassified section '{header_text}' with {len(trains)} trains"
+                            "Unclassified section '%s' with %s trains",
+                            header_text,
+                            len(trains),
                         )
 
         # If no sections found, try to parse all tables and assume first is outbound, second is return
         if not outbound_trains and not return_trains:
             tables = page.query_selector_all("table")
-            logger.debug(f"Found {len(tables)} tables")
+            logger.debug("Found %s tables", len(tables))
 
             if len(tables) >= 2:
                 # Parse all tables and analyze their content
                 all_table_trains = []
                 for i, table in enumerate(tables):
                     trains = self._parse_table_rows(table)
-                    logger.debug(f"Table {i+1}: {len(trains)} trains")
+                    logger.debug("Table %s: %s trains", i + 1, len(trains))
                     for train in trains:
                         logger.debug(
-                            f"  Table {i+1} train: {train.get('train_number')} at {train.get('departure_time')}"
+                            "  Table %s train: %s at %s",
+                            i + 1,
+                            train.get('train_number'),
+                            train.get('departure_time'),
                         )
                     all_table_trains.append((i, trains))
 
@@ -681,7 +983,7 @@ class KTMBShuttleScraper:
                 # Look for patterns in train numbers or times
                 for table_idx, trains in all_table_trains:
                     if not trains:
-                        logger.debug(f"Table {table_idx+1} is empty")
+                        logger.debug("Table %s is empty", table_idx + 1)
                         continue
 
                     # Check if this looks like outbound trains (SG->JB)
@@ -690,58 +992,64 @@ class KTMBShuttleScraper:
                     return_count = 0
 
                     for train in trains:
-                        train_number = train.get("train_number", "")
-                        departure_time = train.get("departure_time", "")
+                        match = _TRAIN_NUM_RE.search(train.get("train_number", ""))
+                        num = int(match.group(1)) if match else -1
 
                         # Check if this looks like an outbound train
                         # Outbound trains (SG->JB) typically have even numbers: 78, 80, 82, 84, 86, 88, 90, 92, 94, 96
                         # Return trains (JB->SG) typically have odd numbers: 77, 79, 81, 83, 85, 87, 89, 91, 93, 95
-                        if any(
-                            str(num) in train_number
-                            for num in [78, 80, 82, 84, 86, 88, 90, 92, 94, 96]
-                        ):
-                            outbound_count += 1
-                        elif any(
-                            str(num) in train_number
-                            for num in [77, 79, 81, 83, 85, 87, 89, 91, 93, 95]
-                        ):
-                            return_count += 1
+                        if 77 <= num <= 96:
+                            if num % 2 == 0:
+                                outbound_count += 1
+                            else:
+                                return_count += 1
 
                     logger.debug(
-                        f"Table {table_idx+1}: {outbound_count} potential outbound, {return_count} potential return trains"
+                        "Table %s: %s potential outbound, %s potential return trains",
+                        table_idx + 1,
+                        outbound_count,
+                        return_count,
                     )
 
                     if outbound_count > return_count:
                         outbound_trains.extend(trains)
                         logger.debug(
-                            f"Classified table {table_idx+1} as outbound with {len(trains)} trains"
+                            "Classified table %s as outbound with %s trains",
+                            table_idx + 1,
+                            len(trains),
                         )
                     elif return_count > outbound_count:
                         return_trains.extend(trains)
                         logger.debug(
-                            f"Classified table {table_idx+1} as return with {len(trains)} trains"
+                            "Classified table %s as return with %s trains",
+                            table_idx + 1,
+                            len(trains),
                         )
                     else:
                         # If we can't determine, assume first table is outbound, second is return
                         if table_idx == 0:
                             outbound_trains.extend(trains)
                             logger.debug(
-                                f"Assumed table {table_idx+1} is outbound (first table)"
+                                "Assumed table %s is outbound (first table)",
+                                table_idx + 1,
                             )
                         else:
                             return_trains.extend(trains)
                             logger.debug(
-                                f"Assumed table {table_idx+1} is return (not first table)"
+                                "Assumed table %s is return (not first table)",
+                                table_idx + 1,
                             )
 
                 logger.debug(
-                    f"Final classification: {len(outbound_trains)} outbound and {len(return_trains)} return trains"
+                    "Final classification: %s outbound and %s return trains",
+                    len(outbound_trains),
+                    len(return_trains),
                 )
 
             elif len(tables) == 1:
                 # Single table - might contain both directions or just one
                 all_trains = self._parse_table_rows(tables[0])
-                logger.debug(f"Single table found with {len(all_trains)} trains")
+                logger.debug("Single table found with %s trains", len(all_trains))
                 # Try to separate by direction if possible
                 for train in all_trains:
                     # This is a simplified approach - in practice, you might need more sophisticated logic
@@ -757,25 +1065,26 @@ class KTMBShuttleScraper:
             )
 
             # Try to find any train rows on the page
-            all_rows = page.query_selector_all("tr")
-            logger.debug(f"Found {len(all_rows)} total rows on page")
+            all_rows = _extract_row_cells(page, "tr")
+            logger.debug("Found %s total rows on page", len(all_rows))
+
+            direction_value = self._direction_value
 
             # Look for rows that might contain train data
-            for i, row in enumerate(all_rows):
-                cells = row.query_selector_all("td")
+            for i, cells in enumerate(all_rows):
                 if len(cells) >= 3:  # At least 3 columns (train, departure, arrival)
                     try:
                         # Try to parse this as a train row
                         if len(cells) >= 5:
-                            train_number = cells[0].inner_text().strip()
-                            departure_time = cells[1].inner_text().strip()
-                            arrival_time = cells[2].inner_text().strip()
-                            available_seats = int(cells[4].inner_text().strip())
+                            train_number = cells[0]
+                            departure_time = cells[1]
+                            arrival_time = cells[2]
+                            available_seats = int(cells[4])
                         elif len(cells) >= 4:
-                            train_number = cells[0].inner_text().strip()
-                            departure_time = cells[1].inner_text().strip()
-                            arrival_time = cells[2].inner_text().strip()
-                            available_seats = int(cells[3].inner_text().strip())
+                            train_number = cells[0]
+                            departure_time = cells[1]
+                            arrival_time = cells[2]
+                            available_seats = int(cells[3])
                         else:
                             continue
 
@@ -785,28 +1094,40 @@ class KTMBShuttleScraper:
                                 "departure_time": departure_time,
                                 "arrival_time": arrival_time,
                                 "available_seats": available_seats,
-                                "direction": self.settings.direction.value,
+                                "direction": direction_value,
                             }
                             logger.debug(
-                                f"Found train in row {i}: {train_number} at {departure_time}"
+                                "Found train in row %s: %s at %s",
+                                i,
+                                train_number,
+                                departure_time,
                             )
                             # For now, assume all trains are outbound (we'll need to refine this)
                             outbound_trains.append(train_info)
                     except (ValueError, IndexError) as e:
                         continue
 
-        # Log raw train data before filtering
-        logger.debug(f"Raw outbound trains before filtering: {len(outbound_trains)}")
-        for train in outbound_trains:
+        # Log raw train data before filtering (skip the loops entirely unless debugging)
+        if logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"  Raw outbound: {train.get('train_number')} at {train.get('departure_time')} with {train.get('available_seats')} seats"
+                "Raw outbound trains before filtering: %s", len(outbound_trains)
             )
+            for train in outbound_trains:
+                logger.debug(
+                    "  Raw outbound: %s at %s with %s seats",
+                    train.get('train_number'),
+                    train.get('departure_time'),
+                    train.get('available_seats'),
+                )
 
-        logger.debug(f"Raw return trains before filtering: {len(return_trains)}")
-        for train in return_trains:
-            logger.debug(
-                f"  Raw return: {train.get('train_number')} at {train.get('departure_time')} with {train.get('available_seats')} seats"
-            )
+            logger.debug("Raw return trains before filtering: %s", len(return_trains))
+            for train in return_trains:
+                logger.debug(
+                    "  Raw return: %s at %s with %s seats",
+                    train.get('train_number'),
+                    train.get('departure_time'),
+                    train.get('available_seats'),
+                )
 
         # Filter trains based on criteria
         filtered_outbound = self._filter_trains(outbound_trains)
@@ -821,27 +1142,21 @@ class KTMBShuttleScraper:
             "available_trains": filtered_outbound,
             "return_trains": filtered_return,
             "total_available": len(filtered_outbound) + len(filtered_return),
-            "search_criteria": {
-                "direction": self.settings.direction.value,
-                "depart_date": self.settings.depart_date.strftime("%Y-%m-%d"),
-                "return_date": (
-                    self.settings.return_date.strftime("%Y-%m-%d")
-                    if self.settings.return_date
-                    else None
-                ),
-                "passengers": self.settings.total_pax,
-                "min_seats": self.settings.min_available_seats,
-            },
+            "search_criteria": {**self._search_criteria_template},
             "scraped_at": datetime.now().isoformat(),
         }
 
     def _parse_table_rows(self, table) -> List[Dict]:
         """Parse train rows from a table element"""
+        return self._parse_row_cells(_extract_table_rows(table))
+
+    def _parse_row_cells(self, rows: List[List[str]]) -> List[Dict]:
+        """Parse train rows from already-extracted cell texts"""
         trains = []
-        rows = table.query_selector_all("tbody tr, tr")
+        append = trains.append
+        direction_value = self._direction_value
 
-        for row in rows:
-            cells = row.query_selector_all("td")
+        for cells in rows:
             if not cells or len(cells) < 3:
                 continue
 
@@ -849,34 +1164,34 @@ class KTMBShuttleScraper:
                 # Extract train information - try different column layouts
                 if len(cells) >= 5:
                     # Standard layout: train number, departure, arrival, duration, seats
-                    train_number = cells[0].inner_text().strip()
-                    departure_time = cells[1].inner_text().strip()
-                    arrival_time = cells[2].inner_text().strip()
-                    available_seats = int(cells[4].inner_text().strip())
+                    train_number = cells[0]
+                    departure_time = cells[1]
+                    arrival_time = cells[2]
+                    available_seats = int(cells[4])
                 elif len(cells) >= 4:
                     # Alternative layout: train number, departure, arrival, seats
-                    train_number = cells[0].inner_text().strip()
-                    departure_time = cells[1].inner_text().strip()
-                    arrival_time = cells[2].inner_text().strip()
-                    available_seats = int(cells[3].inner_text().strip())
+                    train_number = cells[0]
+                    departure_time = cells[1]
+                    arrival_time = cells[2]
+                    available_seats = int(cells[3])
                 else:
                     # Minimal layout: departure, arrival, seats
                     train_number = f"Train {len(trains) + 1}"
-                    departure_time = cells[0].inner_text().strip()
-                    arrival_time = cells[1].inner_text().strip()
-                    available_seats = int(cells[2].inner_text().strip())
+                    departure_time = cells[0]
+                    arrival_time = cells[1]
+                    available_seats = int(cells[2])
 
                 train_info = {
                     "train_number": train_number,
                     "departure_time": departure_time,
                     "arrival_time": arrival_time,
                     "available_seats": available_seats,
-                    "direction": self.settings.direction.value,
+                    "direction": direction_value,
                 }
-                trains.append(train_info)
+                append(train_info)
 
             except (ValueError, IndexError) as e:
-                logger.warning(f"Skipping row due to parsing error: {e}")
+                logger.warning("Skipping row due to parsing error: %s", e)
                 continue
 
         return trains
@@ -885,43 +1200,70 @@ class KTMBShuttleScraper:
         """Filter trains based on criteria"""
         filtered = []
 
-        logger.debug(
-            f"Filtering {len(trains)} trains with criteria: min_seats={self.settings.min_available_seats}, max_seats={self.settings.max_available_seats}, time_slots={[ts.value for ts in self.settings.desired_time_slots]}"
-        )
+        # Read settings once, and only build log messages when they will be emitted
+        min_seats = self.settings.min_available_seats
+        max_seats = self.settings.max_available_seats
+        in_desired_slots = self._is_train_in_desired_time_slots
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        if debug:
+            logger.debug(
+                "Filtering %s trains with criteria: min_seats=%s, max_seats=%s, time_slots=%s",
+                len(trains),
+                min_seats,
+                max_seats,
+                [ts.value for ts in self.settings.desired_time_slots],
+            )
 
         for train in trains:
             available_seats = train.get("available_seats", 0)
             departure_time = train.get("departure_time", "")
-            train_number = train.get("train_number", "Unknown")
 
-            logger.debug(
-                f"Checking train {train_number}: {departure_time} with {available_seats} seats"
-            )
+            if debug:
+                train_number = train.get("train_number", "Unknown")
+                logger.debug(
+                    "Checking train %s: %s with %s seats",
+                    train_number,
+                    departure_time,
+                    available_seats,
+                )
 
             # Check if this train meets our criteria
-            seats_in_range = available_seats >= self.settings.min_available_seats
-            if self.settings.max_available_seats is not None:
-                seats_in_range = seats_in_range and available_seats <= self.settings.max_available_seats
-            
+            seats_in_range = available_seats >= min_seats
+            if max_seats is not None:
+                seats_in_range = seats_in_range and available_seats <= max_seats
+
             if seats_in_range:
-                logger.debug(
-                    f"  Train {train_number} has seats in range ({self.settings.min_available_seats} <= {available_seats} <= {self.settings.max_available_seats or 'unlimited'})"
-                )
+                if debug:
+                    logger.debug(
+                        "  Train %s has seats in range (%s <= %s <= %s)",
+                        train_number,
+                        min_seats,
+                        available_seats,
+                        max_seats or "unlimited",
+                    )
                 # Check if train is in desired time slots
-                if self._is_train_in_desired_time_slots(departure_time):
+                if in_desired_slots(departure_time):
                     filtered.append(train)
-                    logger.debug(f"  ✓ Added train {train_number} to filtered list")
-                else:
-                    logger.debug(f"  ✗ Train {train_number} not in desired time slots")
-            else:
-                if available_seats < self.settings.min_available_seats:
+                    if debug:
+                        logger.debug("  ✓ Added train %s to filtered list", train_number)
+                elif debug:
+                    logger.debug("  ✗ Train %s not in desired time slots", train_number)
+            elif debug:
+                if available_seats < min_seats:
                     logger.debug(
-                        f"  ✗ Train {train_number} has insufficient seats ({available_seats} < {self.settings.min_available_seats})"
+                        "  ✗ Train %s has insufficient seats (%s < %s)",
+                        train_number,
+                        available_seats,
+                        min_seats,
                     )
-                elif self.settings.max_available_seats is not None and available_seats > self.settings.max_available_seats:
+                elif max_seats is not None and available_seats > max_seats:
                     logger.debug(
-                        f"  ✗ Train {train_number} has too many seats ({available_seats} > {self.settings.max_available_seats}), indicating non-popular period"
+                        "  ✗ Train %s has too many seats (%s > %s), indicating non-popular period",
+                        train_number,
+                        available_seats,
+                        max_seats,
                     )
 
-        logger.debug(f"Filtered result: {len(filtered)} trains out of {len(trains)}")
+        logger.debug("Filtered result: %s trains out of %s", len(filtered), len(trains))
         return filtered
@@ -2,7 +2,7 @@
 
 from playwright.sync_api import Page
 from utils.logging_config import get_logger
-from utils.config import TrainTiming, TimeSlot, TIME_SLOT_RANGES
+from utils.config import TrainTiming, TimeSlot, classify_time_slot
 from typing import List, Optional
 from datetime import time
 import re
@@ -10,6 +10,57 @@ import re
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Collects the trimmed text of every <td> per matched row, so a whole table
+# comes back in one round-trip instead of one inner_text() call per cell.
+# textContent (with whitespace collapsed) rather than innerText, which forces a
+# layout pass
+_ROW_CELLS_JS = """rows => rows.map(
+    row => Array.from(
+        row.querySelectorAll('td'),
+        cell => cell.textContent.replace(/\\s+/g, ' ').trim()
+    )
+)"""
+
+# Seat count patterns like "5 seats", "Available: 3", "3 available" or a bare
+# number, combined so a row needs a single search. Whitespace excludes newlines
+# so a match never spans two cells
+_SEAT_RE = re.compile(
+    r"(?:(?P<seats>\d+)[^\S\n]*seats?)"
+    r"|(?:available:?[^\S\n]*(?P<after>\d+))"
+    r"|(?:(?P<before>\d+)[^\S\n]*available)"
+    r"|(?:^(?P<bare>\d+)$)",
+    re.IGNORECASE | re.MULTILINE,
+)
+_FULL_RE = re.compile(r"\b(?:FULL|SOLD(?: OUT)?|UNAVAILABLE)\b", re.IGNORECASE)
+_TIME_RE = re.compile(r"(\d{1,2}):(\d{2})")
+
+# Common error selectors, joined so the page is queried once
+_ERROR_SELECTOR = ", ".join(
+    [
+        ".alert-danger",
+        ".error-message",
+        ".validation-summary-errors",
+        "[class*='error']",
+    ]
+)
+_FIRST_NON_EMPTY_TEXT_JS = (
+    "elements => elements.map(el => el.innerText.trim()).find(Boolean) || null"
+)
+_NO_RESULTS_RE = re.compile(
+    "|".join(
+        map(
+            re.escape,
+            [
+                "no trains available",
+                "no results found",
+                "tidak ada keretapi",
+                "tiada keputusan",
+            ],
+        )
+    ),
+    re.IGNORECASE,
+)
+
 
 class TrainDataParser:
     """Parses train timing and availability data from KTMB pages."""
@@ -25,8 +76,8 @@ class TrainDataParser:
             # Wait for table to load
             self.page.wait_for_selector("table", timeout=10000)
 
-            # Find all train rows
-            rows = self.page.query_selector_all("table tbody tr")
+            # Fetch the cell texts of every row in one round-trip
+            rows = self.page.eval_on_selector_all("table tbody tr", _ROW_CELLS_JS)
 
             if not rows:
                 logger.warning("No train rows found in table")
@@ -34,16 +85,18 @@ class TrainDataParser:
 
             logger.debug(f"Found {len(rows)} train rows to parse")
 
-            for i, row in enumerate(rows):
+            for i, cells in enumerate(rows):
                 try:
-                    train = self._parse_train_row(row)
+                    train = self._parse_train_row(cells)
                     if train:
                         trains.append(train)
                         logger.debug(
-                            f"Parsed train: {train.train_number} at {train.departure_time}"
+                            "Parsed train: %s at %s",
+                            train.train_number,
+                            train.departure_time,
                         )
                 except Exception as e:
-                    logger.warning(f"Failed to parse row {i}: {e}")
+                    logger.warning("Failed to parse row %s: %s", i, e)
                     continue
 
             logger.debug(f"Successfully parsed {len(trains)} trains")
@@ -53,19 +106,17 @@ class TrainDataParser:
 
         return trains
 
-    def _parse_train_row(self, row) -> Optional[TrainTiming]:
-        """Parse a single train row."""
+    def _parse_train_row(self, cells: List[str]) -> Optional[TrainTiming]:
+        """Parse a single train row from its trimmed cell texts."""
         try:
-            cells = row.query_selector_all("td")
-
             if len(cells) < 4:
                 logger.debug("Row has insufficient columns")
                 return None
 
             # Extract data from cells (adjust indices based on actual table structure)
-            train_number = self._extract_text(cells[0])
-            departure_time = self._extract_text(cells[1])
-            arrival_time = self._extract_text(cells[2])
+            train_number = cells[0]
+            departure_time = cells[1]
+            arrival_time = cells[2]
 
             # Try to find seat availability (could be in different columns)
             available_seats = self._extract_seat_count(cells)
@@ -90,44 +141,21 @@ class TrainDataParser:
             )
 
         except Exception as e:
-            logger.warning(f"Error parsing train row: {e}")
+            logger.warning("Error parsing train row: %s", e)
             return None
 
-    def _extract_text(self, cell) -> str:
-        """Extract clean text from a table cell."""
-        if not cell:
-            return ""
-
-        text = cell.inner_text().strip()
-        return text
-
-    def _extract_seat_count(self, cells) -> int:
-        """Extract available seat count from table cells."""
-        # Look for seat information in various possible columns
-        for cell in cells:
-            text = self._extract_text(cell)
-
-            # Look for patterns like "5 seats", "Available: 3", etc.
-            seat_patterns = [
-                r"(\d+)\s*seats?",
-                r"available:?\s*(\d+)",
-                r"(\d+)\s*available",
-                r"^(\d+)$",  # Just a number
-            ]
-
-            for pattern in seat_patterns:
-                match = re.search(pattern, text.lower())
-                if match:
-                    try:
-                        return int(match.group(1))
-                    except ValueError:
-                        continue
-
-            # Check for "FULL" or "SOLD OUT" indicators
-            if any(
-                keyword in text.upper() for keyword in ["FULL", "SOLD", "UNAVAILABLE"]
-            ):
-                return 0
+    def _extract_seat_count(self, cells: List[str]) -> int:
+        """Extract available seat count from table cell texts."""
+        # Check the seats (last) cell for "FULL" or "SOLD OUT" indicators, so a
+        # train or station name elsewhere in the row cannot zero the count
+        if cells and _FULL_RE.search(cells[-1]):
+            return 0
+
+        # Look for patterns like "5 seats", "Available: 3", etc. Search the whole
+        # row at once, one cell per line so "^...$" still anchors to a single cell
+        match = _SEAT_RE.search("\n".join(cells))
+        if match:
+            return int(next(group for group in match.groups() if group))
 
         # Default to 0 if no seat info found
         logger.debug("No seat count found, defaulting to 0")
@@ -135,71 +163,42 @@ class TrainDataParser:
 
     def _determine_time_slot(self, time_str: str) -> TimeSlot:
         """Determine which time slot a departure time falls into."""
-        try:
-            # Extract time from string (handle formats like "07:30", "7:30 AM", etc.)
-            time_match = re.search(r"(\d{1,2}):(\d{2})", time_str)
-
-            if not time_match:
-                logger.debug(f"Could not parse time from: {time_str}")
-                return TimeSlot.MORNING  # Default fallback
-
-            hour = int(time_match.group(1))
-            minute = int(time_match.group(2))
+        # Extract time from string (handle formats like "07:30", "7:30 AM", etc.)
+        time_match = _TIME_RE.search(time_str)
 
-            # Handle AM/PM if present
-            if "PM" in time_str.upper() and hour != 12:
-                hour += 12
-            elif "AM" in time_str.upper() and hour == 12:
-                hour = 0
+        if not time_match:
+            logger.debug("Could not parse time from: %s", time_str)
+            return classify_time_slot(None)
 
-            departure_time = time(hour, minute)
+        hour = int(time_match.group(1))
+        minute = int(time_match.group(2))
 
-            # Check which time slot this falls into
-            for slot, (start_time, end_time) in TIME_SLOT_RANGES.items():
-                if start_time <= end_time:  # Normal range (not crossing midnight)
-                    if start_time <= departure_time <= end_time:
-                        return slot
-                else:  # Range crosses midnight (like night slot)
-                    if departure_time >= start_time or departure_time <= end_time:
-                        return slot
+        # Handle AM/PM if present
+        if "PM" in time_str.upper() and hour != 12:
+            hour += 12
+        elif "AM" in time_str.upper() and hour == 12:
+            hour = 0
 
-            # Default fallback
-            return TimeSlot.MORNING
-
-        except Exception as e:
-            logger.warning(f"Error determining time slot for {time_str}: {e}")
-            return TimeSlot.MORNING
+        try:
+            return classify_time_slot(time(hour, minute))
+        except ValueError as e:
+            logger.warning("Error determining time slot for %s: %s", time_str, e)
+            return classify_time_slot(None)
 
     def check_for_errors(self) -> Optional[str]:
         """Check if the page contains any error messages."""
         try:
-            # Common error selectors
-            error_selectors = [
-                ".alert-danger",
-                ".error-message",
-                ".validation-summary-errors",
-                "[class*='error']",
-            ]
-
-            for selector in error_selectors:
-                error_elements = self.page.query_selector_all(selector)
-                for element in error_elements:
-                    error_text = element.inner_text().strip()
-                    if error_text:
-                        return error_text
+            # Text of the first non-empty error element, in a single query
+            error_text = self.page.eval_on_selector_all(
+                _ERROR_SELECTOR, _FIRST_NON_EMPTY_TEXT_JS
+            )
+            if error_text:
+                return error_text
 
             # Check for "no results" messages
-            no_results_text = [
-                "no trains available",
-                "no results found",
-                "tidak ada keretapi",
-                "tiada keputusan",
-            ]
-
-            page_text = self.page.inner_text("body").lower()
-            for text in no_results_text:
-                if text in page_text:
-                    return f"No trains available for selected criteria"
+            page_text = self.page.inner_text("body")
+            if _NO_RESULTS_RE.search(page_text):
+                return f"No trains available for selected criteria"
 
             return None
 
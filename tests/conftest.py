@@ -0,0 +1,15 @@
+"""
+Shared pytest configuration: tests in INTEGRATION_MODULES are marked
+"integration" and skipped by the default run (see pyproject.toml)
+"""
+
+import pytest
+
+# Test modules that exercise the monitor entry point end to end
+INTEGRATION_MODULES = {"test_monitor_integration.py"}
+
+
+def pytest_collection_modifyitems(config, items):
+    for item in items:
+        if item.path.name in INTEGRATION_MODULES:
+            item.add_marker(pytest.mark.integration)
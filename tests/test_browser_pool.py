@@ -0,0 +1,54 @@
+"""
+Tests for the shared-browser context pool in scraper/browser_pool.py
+"""
+
+import sys
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.browser_pool import BrowserPool
+
+
+class TestBrowserPool(unittest.TestCase):
+    """Test that the browser is launched once and contexts are lent out"""
+
+    def setUp(self):
+        patcher = patch("scraper.browser_pool.sync_playwright")
+        self.mock_sync_playwright = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.playwright = self.mock_sync_playwright.return_value.start.return_value
+        self.launch = self.playwright.chromium.launch
+
+    def test_launches_once_across_acquires(self):
+        pool = BrowserPool()
+        for _ in range(3):
+            pool.release(pool.acquire(viewport={"width": 800, "height": 600}))
+
+        self.assertEqual(self.launch.call_count, 1)
+        browser = self.launch.return_value
+        self.assertEqual(browser.new_context.call_count, 3)
+        self.assertEqual(browser.new_context.return_value.close.call_count, 3)
+
+    def test_relaunches_disconnected_browser(self):
+        pool = BrowserPool()
+        pool.acquire()
+        self.launch.return_value.is_connected.return_value = False
+        self.launch.return_value = MagicMock()
+
+        pool.acquire()
+
+        self.assertEqual(self.launch.call_count, 2)
+
+    def test_close_releases_outstanding_contexts(self):
+        with BrowserPool() as pool:
+            context = pool.acquire()
+
+        context.close.assert_called_once()
+        self.playwright.stop.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,4 @@
 import unittest
-import time
 from unittest.mock import patch, MagicMock
 import sys
 import os
@@ -11,190 +10,99 @@ from notifications.healthchecks import HealthCheckPinger
 
 
 class TestHealthCheckPinger(unittest.TestCase):
-    """Integration tests for HealthCheckPinger class"""
+    """Tests for HealthCheckPinger with the HTTP calls patched out"""
 
     def setUp(self):
         """Set up test fixtures"""
         self.test_url = "https://hc-ping.com/test-uuid"
-        self.short_interval = 1  # 1 second for faster testing
 
-    def tearDown(self):
-        """Clean up after tests"""
-        pass
-
-    @patch("notifications.healthchecks.requests.get")
-    def test_healthcheck_pinger_initialization(self, mock_get):
-        """Test HealthCheckPinger initialization"""
-        # Mock successful response
+    @staticmethod
+    def _ok_response():
+        """A response whose raise_for_status() passes"""
         mock_response = MagicMock()
         mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        return mock_response
 
-        pinger = HealthCheckPinger(self.test_url, self.short_interval)
+    def test_healthcheck_pinger_initialization(self):
+        """Test HealthCheckPinger initialization"""
+        pinger = HealthCheckPinger(self.test_url)
 
         self.assertEqual(pinger.url, self.test_url)
-        self.assertEqual(pinger.ping_interval, self.short_interval)
-        self.assertFalse(pinger.is_running())
-
-    @patch("notifications.healthchecks.requests.get")
-    def test_healthcheck_pinger_start_stop(self, mock_get):
-        """Test starting and stopping the pinger"""
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-
-        pinger = HealthCheckPinger(self.test_url, self.short_interval)
-
-        # Test start
-        result = pinger.start()
-        self.assertTrue(result)
-        self.assertTrue(pinger.is_running())
-
-        # Wait a bit to ensure thread is running
-        time.sleep(0.1)
-
-        # Test stop
-        pinger.stop()
-        self.assertFalse(pinger.is_running())
-
-        # Verify pings were sent
-        self.assertGreaterEqual(mock_get.call_count, 1)
 
     @patch("notifications.healthchecks.requests.get")
-    def test_healthcheck_pinger_context_manager(self, mock_get):
-        """Test using HealthCheckPinger as a context manager"""
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-
-        with HealthCheckPinger(self.test_url, self.short_interval) as pinger:
-            self.assertTrue(pinger.is_running())
-            time.sleep(0.1)  # Let it run for a bit
+    def test_healthcheck_pinger_ping(self, mock_get):
+        """Test that ping() sends a GET to the check URL"""
+        mock_get.return_value = self._ok_response()
 
-        # Should be stopped after context exit
-        self.assertFalse(pinger.is_running())
+        pinger = HealthCheckPinger(self.test_url + "/")
 
-    @patch("notifications.healthchecks.requests.get")
-    def test_healthcheck_pinger_failure_ping(self, mock_get):
-        """Test sending failure pings"""
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
+        self.assertTrue(pinger.ping())
+        mock_get.assert_called_once_with(self.test_url, timeout=10)
 
-        pinger = HealthCheckPinger(self.test_url, self.short_interval)
+    @patch("notifications.healthchecks.requests.post")
+    def test_healthcheck_pinger_failure_ping(self, mock_post):
+        """Test that ping_fail() posts to the /fail endpoint"""
+        mock_post.return_value = self._ok_response()
 
-        # Send failure ping
-        result = pinger.send_failure_ping()
-        self.assertTrue(result)
+        pinger = HealthCheckPinger(self.test_url)
 
-        # Verify failure URL was called
-        expected_failure_url = f"{self.test_url}/fail"
-        mock_get.assert_called_with(expected_failure_url, timeout=10)
+        self.assertTrue(pinger.ping_fail())
+        mock_post.assert_called_once_with(f"{self.test_url}/fail", timeout=10)
 
+    @patch("notifications.healthchecks.requests.post")
     @patch("notifications.healthchecks.requests.get")
-    def test_healthcheck_pinger_no_url(self, mock_get):
+    def test_healthcheck_pinger_no_url(self, mock_get, mock_post):
         """Test pinger behavior with no URL"""
-        pinger = HealthCheckPinger("", self.short_interval)
-
-        # Should not start without URL
-        result = pinger.start()
-        self.assertFalse(result)
-        self.assertFalse(pinger.is_running())
+        pinger = HealthCheckPinger("")
 
-        # Should not send pings without URL
-        result = pinger.send_failure_ping()
-        self.assertFalse(result)
+        self.assertFalse(pinger.ping())
+        self.assertFalse(pinger.ping_fail())
 
         # No HTTP requests should be made
         mock_get.assert_not_called()
-
-    @patch("notifications.healthchecks.requests.get")
-    def test_healthcheck_pinger_double_start(self, mock_get):
-        """Test that pinger cannot be started twice"""
-        # Mock successful response
-        mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-
-        pinger = HealthCheckPinger(self.test_url, self.short_interval)
-
-        # First start should succeed
-        result1 = pinger.start()
-        self.assertTrue(result1)
-
-        # Second start should fail
-        result2 = pinger.start()
-        self.assertFalse(result2)
-
-        pinger.stop()
+        mock_post.assert_not_called()
 
     @patch("notifications.healthchecks.requests.get")
     def test_healthcheck_pinger_network_error(self, mock_get):
-        """Test pinger behavior when network requests fail"""
-        # Mock network error
+        """Test that a failed request is reported rather than raised"""
         mock_get.side_effect = Exception("Network error")
 
-        pinger = HealthCheckPinger(self.test_url, self.short_interval)
-
-        # Start should still succeed even if initial ping fails
-        result = pinger.start()
-        self.assertTrue(result)
-        self.assertTrue(pinger.is_running())
-
-        # Wait a bit for the ping loop to run
-        time.sleep(0.1)
+        pinger = HealthCheckPinger(self.test_url)
 
-        pinger.stop()
+        self.assertFalse(pinger.ping())
+        mock_get.assert_called_once()
 
-        # Verify that requests were attempted despite errors
-        self.assertGreaterEqual(mock_get.call_count, 1)
-
-    @patch("notifications.healthchecks.requests.get")
-    def test_healthcheck_pinger_multiple_pings(self, mock_get):
-        """Test that multiple pings are sent over time"""
-        # Mock successful response
+    @patch("notifications.healthchecks.requests.post")
+    def test_healthcheck_pinger_http_error(self, mock_post):
+        """Test that an HTTP error status makes ping_fail() return False"""
         mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_get.return_value = mock_response
-
-        pinger = HealthCheckPinger(self.test_url, self.short_interval)
-
-        # Start pinger
-        pinger.start()
-
-        # Wait for multiple ping intervals
-        time.sleep(2.5)  # Should trigger at least 2 pings
+        mock_response.raise_for_status.side_effect = Exception("404 Not Found")
+        mock_post.return_value = mock_response
 
-        pinger.stop()
+        pinger = HealthCheckPinger(self.test_url)
 
-        # Verify multiple pings were sent
-        self.assertGreaterEqual(mock_get.call_count, 2)
+        self.assertFalse(pinger.ping_fail())
 
-    def test_send_healthchecks_ping_function(self):
-        """Test the standalone send_healthchecks_ping function"""
-        with patch("notifications.healthchecks.requests.get") as mock_get:
-            # Mock successful response
-            mock_response = MagicMock()
-            mock_response.raise_for_status.return_value = None
-            mock_get.return_value = mock_response
+    def test_send_healthchecks_ping_functions(self):
+        """Test the standalone send_healthchecks_ping(_fail) functions"""
+        with patch("notifications.healthchecks.requests.get") as mock_get, \
+                patch("notifications.healthchecks.requests.post") as mock_post:
+            mock_get.return_value = self._ok_response()
+            mock_post.return_value = self._ok_response()
 
             # Test success ping
-            result = HealthCheckPinger.send_healthchecks_ping(self.test_url, success=True)
+            result = HealthCheckPinger.send_healthchecks_ping(self.test_url)
             self.assertTrue(result)
             mock_get.assert_called_with(self.test_url, timeout=10)
 
             # Test failure ping
-            result = HealthCheckPinger.send_healthchecks_ping(self.test_url, success=False)
+            result = HealthCheckPinger.send_healthchecks_ping_fail(self.test_url)
             self.assertTrue(result)
-            expected_failure_url = f"{self.test_url}/fail"
-            mock_get.assert_called_with(expected_failure_url, timeout=10)
+            mock_post.assert_called_with(f"{self.test_url}/fail", timeout=10)
 
             # Test with empty URL
-            result = HealthCheckPinger.send_healthchecks_ping("", success=True)
-            self.assertFalse(result)
+            self.assertFalse(HealthCheckPinger.send_healthchecks_ping(""))
+            self.assertFalse(HealthCheckPinger.send_healthchecks_ping_fail(""))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,210 @@
+"""
+Tests for duplicate-notification suppression in utils/notification_cache.py
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.config import ScraperSettings, Direction
+from utils.notification_cache import NotificationCache, KEY_HASH, orjson
+
+
+class TestNotificationCache(unittest.TestCase):
+    """Test cache keys, hits and persistence"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "notification_cache.json")
+        self.settings = ScraperSettings(
+            direction=Direction.SG_TO_JB,
+            depart_date=date.today() + timedelta(days=7),
+            return_date=date.today() + timedelta(days=9),
+        )
+        self.result = {
+            "success": True,
+            "available_trains": [
+                {"train_number": "63", "departure_time": "19:00", "available_seats": 4},
+                {"train_number": "61", "departure_time": "18:00", "available_seats": 2},
+            ],
+            "return_trains": [
+                {"train_number": "78", "departure_time": "20:00", "available_seats": 1},
+            ],
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_key_ignores_train_order(self):
+        cache = NotificationCache(self.cache_path)
+        reordered = dict(
+            self.result, available_trains=list(reversed(self.result["available_trains"]))
+        )
+        self.assertEqual(
+            cache._generate_cache_key(self.result, self.settings),
+            cache._generate_cache_key(reordered, self.settings),
+        )
+
+    def test_key_changes_with_seat_count(self):
+        cache = NotificationCache(self.cache_path)
+        changed = dict(
+            self.result,
+            return_trains=[dict(self.result["return_trains"][0], available_seats=5)],
+        )
+        self.assertNotEqual(
+            cache._generate_cache_key(self.result, self.settings),
+            cache._generate_cache_key(changed, self.settings),
+        )
+
+    def test_key_separates_outbound_and_return_trains(self):
+        cache = NotificationCache(self.cache_path)
+        swapped = dict(
+            self.result,
+            available_trains=self.result["return_trains"],
+            return_trains=self.result["available_trains"],
+        )
+        self.assertNotEqual(
+            cache._generate_cache_key(self.result, self.settings),
+            cache._generate_cache_key(swapped, self.settings),
+        )
+
+    def test_notified_result_is_suppressed_after_reload(self):
+        cache = NotificationCache(self.cache_path, flush_interval_seconds=0)
+        self.assertTrue(cache.should_send_notification(self.result, self.settings))
+        cache.add_to_cache(self.result, self.settings)
+
+        reloaded = NotificationCache(self.cache_path)
+        self.assertFalse(reloaded.should_send_notification(self.result, self.settings))
+
+    def test_expired_entry_notifies_again(self):
+        cache = NotificationCache(self.cache_path, expiry_hours=0)
+        cache.add_to_cache(self.result, self.settings)
+        self.assertTrue(cache.should_send_notification(self.result, self.settings))
+        cache.flush(force=True)
+
+    def test_writes_are_coalesced_until_flush(self):
+        cache = NotificationCache(self.cache_path, flush_interval_seconds=60)
+        cache.add_to_cache(self.result, self.settings)
+        self.assertFalse(os.path.exists(self.cache_path))
+
+        cache.flush()
+        self.assertFalse(os.path.exists(self.cache_path))
+
+        cache.close()
+        reloaded = NotificationCache(self.cache_path)
+        self.assertFalse(reloaded.should_send_notification(self.result, self.settings))
+
+    def test_clean_cache_is_not_rewritten(self):
+        cache = NotificationCache(self.cache_path, flush_interval_seconds=0)
+        cache.add_to_cache(self.result, self.settings)
+
+        reloaded = NotificationCache(self.cache_path)
+        self.assertFalse(reloaded.should_send_notification(self.result, self.settings))
+        with patch("utils.notification_cache.os.replace") as mock_replace:
+            reloaded.flush(force=True)
+        mock_replace.assert_not_called()
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = NotificationCache(self.cache_path, max_entries=2)
+        return_train = self.result["return_trains"][0]
+        results = [
+            dict(self.result, return_trains=[dict(return_train, available_seats=seats)])
+            for seats in (1, 2, 3)
+        ]
+        cache.add_to_cache(results[0], self.settings)
+        cache.add_to_cache(results[1], self.settings)
+        # A hit makes the first result the most recently used
+        self.assertFalse(cache.should_send_notification(results[0], self.settings))
+        cache.add_to_cache(results[2], self.settings)
+
+        self.assertEqual(len(cache.cache_data["entries"]), 2)
+        self.assertFalse(cache.should_send_notification(results[0], self.settings))
+        self.assertTrue(cache.should_send_notification(results[1], self.settings))
+
+    def test_failed_write_keeps_previous_file(self):
+        cache = NotificationCache(self.cache_path, flush_interval_seconds=0)
+        cache.add_to_cache(self.result, self.settings)
+
+        with patch("utils.notification_cache.os.replace", side_effect=OSError("disk full")):
+            cache.cache_data["entries"].clear()
+            cache._dirty = True
+            cache.flush()
+
+        self.assertTrue(cache._dirty)
+        self.assertFalse(os.path.exists(self.cache_path + ".tmp"))
+        reloaded = NotificationCache(self.cache_path)
+        self.assertFalse(reloaded.should_send_notification(self.result, self.settings))
+
+    def test_cleanup_keeps_replaced_entry(self):
+        cache = NotificationCache(
+            self.cache_path, expiry_hours=0, flush_interval_seconds=0
+        )
+        cache.add_to_cache(self.result, self.settings)
+        cache.expiry_hours = 1
+        cache.add_to_cache(self.result, self.settings)
+
+        cache.cleanup_expired()
+        self.assertEqual(len(cache.cache_data["entries"]), 1)
+        self.assertFalse(cache.should_send_notification(self.result, self.settings))
+
+    def test_invalid_expiry_is_cleaned_up(self):
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            f.write(
+                '{"cache_version": "2.0", "key_hash": "%s", '
+                '"entries": {"abc": {"expires_at": "soon"}}}' % KEY_HASH
+            )
+        cache = NotificationCache(self.cache_path, flush_interval_seconds=0)
+        self.assertIn("abc", cache.cache_data["entries"])
+
+        cache.cleanup_expired()
+        self.assertEqual(cache.cache_data["entries"], {})
+
+    def test_file_is_read_on_first_use(self):
+        NotificationCache(self.cache_path, flush_interval_seconds=0).add_to_cache(
+            self.result, self.settings
+        )
+        cache = NotificationCache(self.cache_path)
+        self.assertIsNone(cache._cache_data)
+
+        self.assertFalse(cache.should_send_notification(self.result, self.settings))
+        self.assertEqual(len(cache._cache_data["entries"]), 1)
+
+    @unittest.skipIf(orjson is None, "orjson not installed")
+    def test_large_file_is_parsed_from_mmap(self):
+        NotificationCache(self.cache_path, flush_interval_seconds=0).add_to_cache(
+            self.result, self.settings
+        )
+        with patch("utils.notification_cache.MMAP_THRESHOLD_BYTES", 0):
+            cache = NotificationCache(self.cache_path)
+            self.assertFalse(cache.should_send_notification(self.result, self.settings))
+
+    def test_older_cache_version_is_discarded(self):
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            f.write('{"cache_version": "1.0", "entries": {"abc": {}}}')
+        cache = NotificationCache(self.cache_path)
+        self.assertEqual(cache.cache_data["entries"], {})
+
+    def test_md5_keyed_cache_is_discarded(self):
+        with open(self.cache_path, "w", encoding="utf-8") as f:
+            f.write('{"cache_version": "2.0", "key_hash": "md5", "entries": {"abc": {}}}')
+        cache = NotificationCache(self.cache_path)
+        self.assertEqual(cache.cache_data["entries"], {})
+        self.assertEqual(cache.cache_data["key_hash"], "xxh3_64")
+
+    def test_cleanup_expired(self):
+        cache = NotificationCache(
+            self.cache_path, expiry_hours=0, flush_interval_seconds=0
+        )
+        cache.add_to_cache(self.result, self.settings)
+        cache.cleanup_expired()
+        self.assertEqual(cache.cache_data["entries"], {})
+        self.assertEqual(NotificationCache(self.cache_path).cache_data["entries"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""
+Tests for the cell-text parsing helpers in scraper/parser.py
+"""
+
+import sys
+import os
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.parser import TrainDataParser
+from utils.config import TimeSlot
+
+
+class TestDetermineTimeSlot(unittest.TestCase):
+    """Test the minute lookup table against the slot boundaries"""
+
+    def setUp(self):
+        self.parser = TrainDataParser(page=None)
+
+    def test_slot_boundaries(self):
+        cases = {
+            "05:00": TimeSlot.EARLY_MORNING,
+            "08:59": TimeSlot.EARLY_MORNING,
+            "09:00": TimeSlot.MORNING,
+            "11:59": TimeSlot.MORNING,
+            "12:00": TimeSlot.AFTERNOON,
+            "17:59": TimeSlot.AFTERNOON,
+            "18:00": TimeSlot.EVENING,
+            "21:59": TimeSlot.EVENING,
+            "22:00": TimeSlot.NIGHT,
+            "00:00": TimeSlot.NIGHT,
+            "04:59": TimeSlot.NIGHT,
+        }
+        for time_str, expected in cases.items():
+            with self.subTest(time_str=time_str):
+                self.assertEqual(self.parser._determine_time_slot(time_str), expected)
+
+    def test_am_pm(self):
+        self.assertEqual(self.parser._determine_time_slot("7:30 PM"), TimeSlot.EVENING)
+        self.assertEqual(self.parser._determine_time_slot("12:15 AM"), TimeSlot.NIGHT)
+
+    def test_unparseable_defaults_to_evening(self):
+        self.assertEqual(self.parser._determine_time_slot("soon"), TimeSlot.EVENING)
+        self.assertEqual(self.parser._determine_time_slot("10:75"), TimeSlot.EVENING)
+
+
+class TestExtractSeatCount(unittest.TestCase):
+    """Test seat count extraction from a row's cell texts"""
+
+    def setUp(self):
+        self.parser = TrainDataParser(page=None)
+
+    def test_seat_patterns(self):
+        cases = [
+            (["Shuttle 61", "08:30", "09:00", "5 seats"], 5),
+            (["Shuttle 61", "08:30", "09:00", "Available: 3"], 3),
+            (["Shuttle 61", "08:30", "09:00", "12 available"], 12),
+            (["Shuttle 61", "08:30", "09:00", "00:30", "7"], 7),
+        ]
+        for cells, expected in cases:
+            with self.subTest(cells=cells):
+                self.assertEqual(self.parser._extract_seat_count(cells), expected)
+
+    def test_sold_out_and_missing(self):
+        self.assertEqual(
+            self.parser._extract_seat_count(["Shuttle 61", "08:30", "09:00", "SOLD OUT"]),
+            0,
+        )
+        self.assertEqual(
+            self.parser._extract_seat_count(["Shuttle 61", "08:30", "09:00", "-"]), 0
+        )
+
+    def test_sold_out_words_elsewhere_do_not_zero_seats(self):
+        cases = [
+            ["Sold Street Shuttle", "08:30", "09:00", "5 seats"],
+            ["Shuttle 61", "08:30", "09:00", "5 seats, successfully held"],
+        ]
+        for cells in cases:
+            with self.subTest(cells=cells):
+                self.assertEqual(self.parser._extract_seat_count(cells), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
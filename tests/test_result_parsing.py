@@ -0,0 +1,76 @@
+"""
+Tests for turning extracted result-table rows into filtered trains in scraper/main.py
+"""
+
+import sys
+import os
+import unittest
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.main import KTMBShuttleScraper, logger as scraper_logger
+from utils.config import ScraperSettings, Direction, TimeSlot
+
+
+class FakePage:
+    """Stands in for a Playwright page whose results table is already rendered"""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def wait_for_selector(self, selector, timeout=None):
+        return None
+
+    def evaluate(self, expression, arg=None):
+        # Only used to pick the matching table selector
+        return arg[0]
+
+    def eval_on_selector_all(self, selector, expression):
+        return self.rows
+
+
+class TestParseSingleDirectionResults(unittest.TestCase):
+    def _scraper(self, **overrides):
+        settings = ScraperSettings(
+            direction=Direction.JB_TO_SG,
+            depart_date=date.today(),
+            desired_time_slots=[TimeSlot.EVENING],
+            min_available_seats=2,
+            max_available_seats=20,
+            **overrides,
+        )
+        return KTMBShuttleScraper(settings)
+
+    def test_filters_by_seats_and_time_slot(self):
+        rows = [
+            [],  # header row without <td>
+            ["77", "19:00", "19:05", "0:05", "5"],  # kept
+            ["79", "08:00", "08:05", "0:05", "5"],  # wrong slot
+            ["81", "20:00", "20:05", "0:05", "1"],  # too few seats
+            ["83", "21:00", "21:05", "0:05", "50"],  # too many seats
+            ["85", "21:30", "21:35", "FULL"],  # unparseable seats
+            ["18:30", "18:35", "3"],  # minimal layout
+        ]
+        result = self._scraper()._parse_single_direction_results(FakePage(rows))
+
+        self.assertTrue(result["success"])
+        self.assertEqual(
+            [t["train_number"] for t in result["available_trains"]],
+            ["77", "Train 2"],
+        )
+        self.assertEqual(result["available_trains"][0]["available_seats"], 5)
+        self.assertEqual(result["available_trains"][0]["direction"], "JB_TO_SG")
+        self.assertEqual(result["total_available"], 2)
+
+    def test_unparseable_seats_are_logged(self):
+        rows = [["85", "21:30", "21:35", "FULL"]]
+        with self.assertLogs(scraper_logger, level="WARNING") as logs:
+            result = self._scraper()._parse_single_direction_results(FakePage(rows))
+
+        self.assertEqual(result["available_trains"], [])
+        self.assertIn("Skipping row due to parsing error", logs.output[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Tests for splitting round-trip searches into two one-way scrapes in scraper/main.py
+"""
+
+import sys
+import os
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.main import KTMBShuttleScraper
+from utils.config import ScraperSettings, Direction
+
+
+class TestParallelRoundTrip(unittest.TestCase):
+    """Test that round-trip legs are searched separately and merged"""
+
+    def setUp(self):
+        self.depart = date.today() + timedelta(days=7)
+        self.ret = self.depart + timedelta(days=2)
+        self.settings = ScraperSettings(
+            direction=Direction.SG_TO_JB,
+            depart_date=self.depart,
+            return_date=self.ret,
+        )
+
+    def _fake_run(self, scraper):
+        settings = scraper.settings
+        self.assertIsNone(settings.return_date)
+        return {
+            "success": True,
+            "available_trains": [
+                {
+                    "train_number": f"{settings.direction.value}-1",
+                    "departure_time": "19:00",
+                    "available_seats": 3,
+                    "direction": settings.direction.value,
+                }
+            ],
+            "return_trains": [],
+            "total_available": 1,
+        }
+
+    def test_legs_are_split_and_merged(self):
+        scraper = KTMBShuttleScraper(self.settings)
+        with patch.object(
+            KTMBShuttleScraper, "run", autospec=True, side_effect=self._fake_run
+        ) as mock_run:
+            result = scraper._run_round_trip_parallel()
+
+        legs = {
+            call.args[0].settings.direction: call.args[0].settings
+            for call in mock_run.call_args_list
+        }
+        self.assertEqual(legs[Direction.SG_TO_JB].depart_date, self.depart)
+        self.assertEqual(legs[Direction.JB_TO_SG].depart_date, self.ret)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["available_trains"][0]["direction"], "SG_TO_JB")
+        self.assertEqual(result["return_trains"][0]["direction"], "JB_TO_SG")
+        self.assertEqual(result["total_available"], 2)
+        self.assertEqual(
+            result["search_criteria"]["return_date"], self.ret.isoformat()
+        )
+
+    def test_round_trip_is_searched_on_one_page_by_default(self):
+        scraper = KTMBShuttleScraper(self.settings)
+        with patch.object(scraper, "_run_round_trip_parallel") as parallel, patch.object(
+            scraper, "_run_with_retry", return_value={"success": True}
+        ) as single_page:
+            scraper._run_uncached()
+        parallel.assert_not_called()
+        single_page.assert_called_once()
+
+    def test_one_failed_leg_fails_parallel_round_trip(self):
+        def fake_run(scraper):
+            if scraper.settings.direction == Direction.JB_TO_SG:
+                return {"success": False, "error": "timed out"}
+            return self._fake_run(scraper)
+
+        scraper = KTMBShuttleScraper(self.settings, parallel_round_trip=True)
+        with patch.object(
+            KTMBShuttleScraper, "run", autospec=True, side_effect=fake_run
+        ):
+            result = scraper._run_uncached()
+
+        self.assertFalse(result["success"])
+        self.assertIn("Return search failed: timed out", result["error"])
+        self.assertEqual(result["available_trains"], [])
+        self.assertEqual(result["total_available"], 0)
+
+    def test_failed_leg_fails_round_trip(self):
+        scraper = KTMBShuttleScraper(self.settings)
+        result = scraper._merge_round_trip_results(
+            {"success": True, "available_trains": []},
+            {"success": False, "error": "boom"},
+        )
+        self.assertFalse(result["success"])
+        self.assertIn("Return search failed: boom", result["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
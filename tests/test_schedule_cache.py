@@ -0,0 +1,96 @@
+"""
+Tests for the TTL'd scrape result cache in utils/schedule_cache.py
+"""
+
+import sys
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.main import KTMBShuttleScraper
+from utils.config import ScraperSettings, Direction
+from utils.schedule_cache import ScheduleCache
+
+
+class TestScheduleCache(unittest.TestCase):
+    """Test cache hits, expiry and the scraper's force_rescrape flag"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "schedule_cache.json")
+        self.settings = ScraperSettings(
+            direction=Direction.SG_TO_JB,
+            depart_date=date.today() + timedelta(days=7),
+            schedule_cache_ttl_seconds=300,
+        )
+        self.result = {
+            "success": True,
+            "available_trains": [{"train_number": "61", "available_seats": 3}],
+            "return_trains": [],
+            "total_available": 1,
+        }
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_hit_survives_reload(self):
+        ScheduleCache(self.cache_path).set(self.settings, self.result)
+        self.assertEqual(ScheduleCache(self.cache_path).get(self.settings), self.result)
+
+    def test_results_are_copied_in_and_out(self):
+        cache = ScheduleCache(self.cache_path)
+        cache.set(self.settings, self.result)
+        self.result["available_trains"].clear()
+
+        hit = cache.get(self.settings)
+        hit["available_trains"].append({"train_number": "63"})
+
+        self.assertEqual(
+            cache.get(self.settings)["available_trains"],
+            [{"train_number": "61", "available_seats": 3}],
+        )
+
+    def test_failed_write_keeps_previous_file(self):
+        ScheduleCache(self.cache_path).set(self.settings, self.result)
+        cache = ScheduleCache(self.cache_path)
+        other = self.settings.model_copy(update={"min_available_seats": 2})
+        with patch("utils.schedule_cache.os.replace", side_effect=OSError("disk full")):
+            cache.set(other, self.result)
+
+        self.assertFalse(os.path.exists(self.cache_path + ".tmp"))
+        reloaded = ScheduleCache(self.cache_path)
+        self.assertEqual(reloaded.get(self.settings), self.result)
+        self.assertIsNone(reloaded.get(other))
+
+    def test_key_includes_filters(self):
+        cache = ScheduleCache(self.cache_path)
+        cache.set(self.settings, self.result)
+        other = self.settings.model_copy(update={"min_available_seats": 2})
+        self.assertIsNone(cache.get(other))
+
+    def test_expired_entry_is_a_miss(self):
+        cache = ScheduleCache(self.cache_path, ttl_seconds=0)
+        cache.set(self.settings, self.result)
+        self.assertIsNone(cache.get(self.settings))
+
+    def test_run_uses_cache_unless_forced(self):
+        scraper = KTMBShuttleScraper(self.settings)
+        scraper._schedule_cache = ScheduleCache(self.cache_path)
+
+        with patch.object(
+            KTMBShuttleScraper, "_run_uncached", return_value=self.result
+        ) as mock_scrape:
+            scraper.run()
+            scraper.run()
+            self.assertEqual(mock_scrape.call_count, 1)
+
+            scraper.run(force_rescrape=True)
+            self.assertEqual(mock_scrape.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for departure-time parsing and time slot classification in scraper/main.py
+"""
+
+import sys
+import os
+import unittest
+from datetime import date, time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scraper.main import KTMBShuttleScraper, _fast_parse_hm, _parse_time_str
+from utils.config import ScraperSettings, Direction, TimeSlot
+
+
+class TestFastParseHM(unittest.TestCase):
+    """Test the strptime-free time parser"""
+
+    def test_24_hour(self):
+        self.assertEqual(_fast_parse_hm("19:00"), (19, 0))
+        self.assertEqual(_fast_parse_hm(" 07:30 "), (7, 30))
+
+    def test_12_hour(self):
+        self.assertEqual(_fast_parse_hm("7:00 PM"), (19, 0))
+        self.assertEqual(_fast_parse_hm("7:00PM"), (19, 0))
+        self.assertEqual(_fast_parse_hm("12:15 AM"), (0, 15))
+        self.assertEqual(_fast_parse_hm("12:15 pm"), (12, 15))
+
+    def test_invalid(self):
+        for value in ("", "1900", "25:00", "13:00 PM", "7:5", "abc:de"):
+            with self.assertRaises(ValueError):
+                _fast_parse_hm(value)
+
+    def test_parse_time_str_returns_none_when_unparseable(self):
+        self.assertIsNone(_parse_time_str("not a time"))
+        self.assertEqual(_parse_time_str("8:45 AM"), time(8, 45))
+
+
+class TestGetTimeSlot(unittest.TestCase):
+    """Test classification of departure times into time slots"""
+
+    def setUp(self):
+        settings = ScraperSettings(
+            direction=Direction.JB_TO_SG, depart_date=date.today()
+        )
+        self.scraper = KTMBShuttleScraper(settings)
+
+    def test_slots(self):
+        cases = {
+            "05:00": TimeSlot.EARLY_MORNING,
+            "08:59": TimeSlot.EARLY_MORNING,
+            "09:00": TimeSlot.MORNING,
+            "12:00": TimeSlot.AFTERNOON,
+            "6:30 PM": TimeSlot.EVENING,
+            "22:00": TimeSlot.NIGHT,
+            "00:00": TimeSlot.NIGHT,
+            "04:59": TimeSlot.NIGHT,
+        }
+        for time_str, expected in cases.items():
+            with self.subTest(time_str=time_str):
+                self.assertEqual(self.scraper._get_time_slot(time_str), expected)
+
+    def test_unparseable_defaults_to_evening(self):
+        self.assertEqual(self.scraper._get_time_slot("--:--"), TimeSlot.EVENING)
+
+    def test_desired_time_slots_filter(self):
+        settings = ScraperSettings(
+            direction=Direction.JB_TO_SG,
+            depart_date=date.today(),
+            desired_time_slots=[TimeSlot.MORNING],
+        )
+        scraper = KTMBShuttleScraper(settings)
+        self.assertTrue(scraper._is_train_in_desired_time_slots("10:00"))
+        self.assertFalse(scraper._is_train_in_desired_time_slots("19:00"))
+
+    def test_empty_time_slots_accept_everything(self):
+        settings = ScraperSettings(
+            direction=Direction.JB_TO_SG,
+            depart_date=date.today(),
+            desired_time_slots=[],
+        )
+        scraper = KTMBShuttleScraper(settings)
+        self.assertTrue(scraper._is_train_in_desired_time_slots("19:00"))
+
+    def test_filter_trains_leaves_input_unchanged(self):
+        settings = ScraperSettings(
+            direction=Direction.JB_TO_SG,
+            depart_date=date.today(),
+            desired_time_slots=[TimeSlot.MORNING, TimeSlot.EVENING],
+        )
+        scraper = KTMBShuttleScraper(settings)
+        trains = scraper._parse_row_cells(
+            [
+                ["Shuttle 61", "10:00", "10:05", "-", "5"],
+                ["Shuttle 63", "14:00", "14:05", "-", "5"],
+                ["Shuttle 65", "--:--", "19:05", "-", "5"],
+            ]
+        )
+
+        before = [dict(train) for train in trains]
+
+        filtered = scraper._filter_trains(trains)
+
+        self.assertEqual(
+            [train["train_number"] for train in filtered], ["Shuttle 61", "Shuttle 65"]
+        )
+        self.assertEqual(trains, before)
+
+
+class TestEnumAliases(unittest.TestCase):
+    """Test that enum lookups accept names and CLI spellings"""
+
+    def test_alias_spellings(self):
+        self.assertIs(TimeSlot("EVENING"), TimeSlot.EVENING)
+        self.assertIs(TimeSlot("early-morning"), TimeSlot.EARLY_MORNING)
+        self.assertIs(Direction("jb-to-sg"), Direction.JB_TO_SG)
+
+    def test_unknown_value_still_raises(self):
+        with self.assertRaises(ValueError):
+            TimeSlot("midnight")
+
+    def test_settings_accept_aliases(self):
+        settings = ScraperSettings(
+            direction="sg-to-jb",
+            depart_date=date.today(),
+            desired_time_slots=["Morning"],
+        )
+        self.assertIs(settings.direction, Direction.SG_TO_JB)
+        self.assertEqual(settings.desired_time_slots, [TimeSlot.MORNING])
+
+
+if __name__ == "__main__":
+    unittest.main()
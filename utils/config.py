@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from typing import List, Optional, Dict, Any
+from dataclasses import dataclass, field
 from datetime import date, time
 from enum import Enum
+from types import MappingProxyType
 
 
 # Direction constants based on KTMB Shuttle routes
@@ -9,6 +11,10 @@ class Direction(str, Enum):
     JB_TO_SG = "JB_TO_SG"
     SG_TO_JB = "SG_TO_JB"
 
+    @classmethod
+    def _missing_(cls, value):
+        return _lookup_alias(cls, value)
+
 
 DIRECTION_MAPPING = {
     Direction.JB_TO_SG: "JB Sentral - Woodlands",
@@ -24,6 +30,32 @@ class TimeSlot(str, Enum):
     EVENING = "evening"  # 18:00 - 21:59
     NIGHT = "night"  # 22:00 - 04:59
 
+    @classmethod
+    def _missing_(cls, value):
+        return _lookup_alias(cls, value)
+
+
+def _build_enum_aliases(*enum_classes) -> Dict[type, Dict[str, Enum]]:
+    """Map each member's name and value, lowercased and underscored, to the member"""
+    return {
+        enum_cls: {
+            key.lower().replace("-", "_"): member
+            for member in enum_cls
+            for key in (member.name, member.value)
+        }
+        for enum_cls in enum_classes
+    }
+
+
+def _lookup_alias(enum_cls, value):
+    """Resolve spellings such as "jb-to-sg" or "EVENING" that miss the exact value lookup"""
+    if not isinstance(value, str):
+        return None
+    return _ENUM_ALIASES[enum_cls].get(value.strip().lower().replace("-", "_"))
+
+
+_ENUM_ALIASES = _build_enum_aliases(Direction, TimeSlot)
+
 
 TIME_SLOT_RANGES = {
     TimeSlot.EARLY_MORNING: (time(5, 0), time(8, 59)),
@@ -33,6 +65,36 @@ TIME_SLOT_RANGES = {
     TimeSlot.NIGHT: (time(22, 0), time(4, 59)),
 }
 
+
+def _build_time_slot_by_minute() -> tuple:
+    """Classify every minute of the day once, first matching range wins"""
+    slots = [None] * 1440
+    for slot, (start_time, end_time) in TIME_SLOT_RANGES.items():
+        start = start_time.hour * 60 + start_time.minute
+        end = end_time.hour * 60 + end_time.minute
+        if start <= end:  # Normal range (not crossing midnight)
+            minutes = range(start, end + 1)
+        else:  # Range crosses midnight (like night slot)
+            minutes = [*range(start, 1440), *range(0, end + 1)]
+        for minute in minutes:
+            if slots[minute] is None:
+                slots[minute] = slot
+    return tuple(slot or TimeSlot.NIGHT for slot in slots)
+
+
+# Time slot for each minute of the day, indexed by hour * 60 + minute
+TIME_SLOT_BY_MINUTE = _build_time_slot_by_minute()
+
+
+def classify_time_slot(t: Optional[time]) -> TimeSlot:
+    """Return the time slot a departure time falls into
+
+    None stands for a time that could not be parsed, which counts as evening.
+    """
+    if t is None:
+        return TimeSlot.EVENING
+    return TIME_SLOT_BY_MINUTE[t.hour * 60 + t.minute]
+
 # Browser configuration
 BROWSER_CONFIG = {
     "headless": True,
@@ -42,20 +104,28 @@ BROWSER_CONFIG = {
 }
 
 # Website selectors and URLs
-KTMB_CONFIG = {
+# Read-only: these are shared constants, not per-run settings
+KTMB_CONFIG = MappingProxyType({
     "base_url": "https://shuttleonline.ktmb.com.my/Home/Shuttle",
-    "selectors": {
+    # Plain CSS, by #id wherever the form has one (see docs/KTMB_SELECTORS.md)
+    "selectors": MappingProxyType({
         "direction_dropdown": "select[name='Direction']",
-        "depart_date": "input[name='DepartDate']",
-        "return_date": "input[name='ReturnDate']",
+        "depart_date": "#OnwardDate",
+        "return_date": "#ReturnDate",
+        "passenger_count": "#PassengerCount",
         "adult_pax": "select[name='Adult']",
         "child_pax": "select[name='Child']",
-        "search_button": "input[type='submit'][value='Search']",
-        "train_table": "table.table-striped",
-        "train_rows": "table.table-striped tbody tr",
+        "search_button": "#btnSubmit",
+        "train_table": "#tblTrainList",
+        "train_rows": "#tblTrainList tbody > tr",
         "loading_indicator": ".loading",
-    },
-}
+    }),
+})
+
+
+def bind_ktmb_locators(page) -> Dict[str, Any]:
+    """Return a Locator on the given page for each of KTMB_CONFIG's selectors"""
+    return {name: page.locator(selector) for name, selector in KTMB_CONFIG["selectors"].items()}
 
 
 class ScraperSettings(BaseModel):
@@ -67,14 +137,19 @@ class ScraperSettings(BaseModel):
     desired_time_slots: List[TimeSlot] = Field(default_factory=lambda: list(TimeSlot))
     min_available_seats: int = Field(default=1, ge=1)
     max_available_seats: Optional[int] = Field(default=100, ge=1) 
-
-    @validator("return_date")
-    def validate_return_date(cls, v, values):
-        if v and "depart_date" in values and v < values["depart_date"]:
+    # Save page screenshots to output/ when a search or results parse fails
+    debug_screenshots: bool = False
+    # Reuse a successful result for the same search for this many seconds (0 disables)
+    schedule_cache_ttl_seconds: int = Field(default=0, ge=0)
+
+    @model_validator(mode="after")
+    def validate_return_date(self):
+        if self.return_date and self.return_date < self.depart_date:
             raise ValueError("Return date must be after depart date")
-        return v
+        return self
 
-    @validator("depart_date")
+    @field_validator("depart_date")
+    @classmethod
     def validate_depart_date(cls, v):
         if v < date.today():
             raise ValueError("Depart date cannot be in the past")
@@ -85,7 +160,10 @@ class ScraperSettings(BaseModel):
         return self.num_adults + self.num_children
 
 
-class TrainTiming(BaseModel):
+# Built internally from already-parsed page data, so plain slotted dataclasses
+# rather than validating pydantic models
+@dataclass(slots=True, kw_only=True)
+class TrainTiming:
     departure_time: str
     arrival_time: str
     available_seats: int
@@ -94,9 +172,10 @@ class TrainTiming(BaseModel):
     is_available: bool
 
 
-class ScrapingResult(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ScrapingResult:
     success: bool
-    departure_trains: List[TrainTiming] = Field(default_factory=list)
-    return_trains: List[TrainTiming] = Field(default_factory=list)
+    departure_trains: List[TrainTiming] = field(default_factory=list)
+    return_trains: List[TrainTiming] = field(default_factory=list)
     error_message: Optional[str] = None
     scraped_at: str
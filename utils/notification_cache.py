@@ -6,65 +6,230 @@ Prevents duplicate Telegram notifications for the same train availability
 
 import os
 import json
-import hashlib
+import mmap
+import time
+import heapq
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from operator import itemgetter
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
+import xxhash
 from utils.config import Direction
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is used otherwise
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Cache files at least this large are parsed straight from a memory map
+# (orjson only; the stdlib parser needs a bytes copy anyway)
+MMAP_THRESHOLD_BYTES = 64 * 1024
+
+# Keys are only used for deduplication, so a fast non-cryptographic hash is
+# enough. The key scheme is recorded in the cache file, and a file written with
+# a different version or hash (such as the older MD5 keys) is discarded rather
+# than silently missing
+CACHE_VERSION = "2.0"
+KEY_HASH = "xxh3_64"
+_new_key_hash = xxhash.xxh3_64
+
+
+def _loads(raw: bytes) -> Any:
+    """Parse JSON from bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(data: Any) -> bytes:
+    """Serialize cache data as compact UTF-8 JSON (pipe through jq to read it)"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+# Fields of each stored train row, in order
+TRAIN_FIELDS = ("train_number", "departure_time", "available_seats", "direction")
+
+
+def _train_rows(trains: List[Dict[str, Any]], direction: Optional[str]) -> List[Tuple]:
+    """Pack trains as TRAIN_FIELDS tuples"""
+    return [
+        (train.get("train_number", ""), train.get("departure_time"), train.get("available_seats", 0), direction)
+        for train in trains
+    ]
+
+
+_by_train_number = itemgetter(0)
+
+
+@lru_cache(maxsize=256)
+def _iso(d: Optional[date]) -> Optional[str]:
+    """ISO string of a search date, or None; the same few dates recur every check"""
+    return d.isoformat() if d is not None else None
+
+# Direction value of the return leg, keyed by the outbound direction value
+_OPPOSITE_DIRECTION_VALUE = {
+    Direction.SG_TO_JB.value: Direction.JB_TO_SG.value,
+    Direction.JB_TO_SG.value: Direction.SG_TO_JB.value,
+}
+
 
 class NotificationCache:
     """Manages notification cache to prevent duplicate alerts"""
 
-    def __init__(self, cache_file_path: str = "./cache/notification_cache.json", expiry_hours: int = 24):
+    def __init__(
+        self,
+        cache_file_path: str = "./cache/notification_cache.json",
+        expiry_hours: int = 24,
+        flush_interval_seconds: float = 60,
+        max_entries: int = 10_000,
+    ):
         """
         Initialize notification cache
         
         Args:
             cache_file_path: Path to JSON cache file
             expiry_hours: Hours until cache entries expire (default: 24)
+            flush_interval_seconds: Minimum seconds between cache file writes;
+                changes in between are written by the next flush() or close()
+                (default: 60, 0 writes on every change)
+            max_entries: Most entries kept; the least recently used are evicted
+                beyond this (default: 10,000)
         """
         self.cache_file_path = Path(cache_file_path)
         self.expiry_hours = expiry_hours
-        self.cache_data = self._load_cache()
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_entries = max_entries
+        # The file is read on first use, see _ensure_loaded()
+        self._cache_data: Optional[Dict[str, Any]] = None
+        # expires_at of each entry as Unix seconds, so lookups and cleanup are
+        # integer compares
+        self._expiry_index: Dict[str, int] = {}
+        # (expires_at, key) min-heap so cleanup only visits expired entries.
+        # Stale pairs left by replaced or deleted entries are skipped when
+        # popped, as they no longer match _expiry_index
+        self._expiry_heap: List[Tuple[int, str]] = []
+        self._dirty = False
+        self._last_flush = time.monotonic()
     
-    @staticmethod
-    def _get_opposite_direction(direction: Direction) -> Direction:
-        """Get the opposite direction for return trips"""
-        if direction == Direction.SG_TO_JB:
-            return Direction.JB_TO_SG
-        else:
-            return Direction.SG_TO_JB
+    @property
+    def cache_data(self) -> Dict[str, Any]:
+        """Cache contents, loaded from the file on first access"""
+        self._ensure_loaded()
+        return self._cache_data
+
+    def _ensure_loaded(self) -> None:
+        """Load the cache file and build the expiry index and heap, once"""
+        if self._cache_data is not None:
+            return
+        self._cache_data = self._load_cache()
+        self._expiry_index = self._build_expiry_index(self._cache_data["entries"])
+        self._expiry_heap = [(expires_at, key) for key, expires_at in self._expiry_index.items()]
+        heapq.heapify(self._expiry_heap)
 
     def _load_cache(self) -> Dict[str, Any]:
         """Load cache from JSON file"""
         try:
             if self.cache_file_path.exists():
-                with open(self.cache_file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    logger.debug(f"Loaded cache with {len(data.get('entries', {}))} entries")
-                    return data
+                data = self._read_cache_file()
+                if data.get("cache_version") != CACHE_VERSION or data.get("key_hash") != KEY_HASH:
+                    logger.info("Cache file uses an older key scheme, creating new cache")
+                    return self._empty_cache()
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Loaded cache with %d entries", len(data.get('entries', {})))
+                return data
             else:
                 logger.info("No existing cache file found, creating new cache")
-                return {"cache_version": "1.0", "entries": {}}
+                return self._empty_cache()
         except Exception as e:
             logger.warning(f"Failed to load cache file: {e}, creating new cache")
-            return {"cache_version": "1.0", "entries": {}}
+            return self._empty_cache()
 
-    def _save_cache(self) -> None:
-        """Save cache to JSON file"""
+    def _read_cache_file(self) -> Dict[str, Any]:
+        """Parse the cache file"""
+        with open(self.cache_file_path, 'rb') as f:
+            if orjson is None or os.fstat(f.fileno()).st_size < MMAP_THRESHOLD_BYTES:
+                return _loads(f.read())
+            
+            # Parse from the page cache without copying the file into a bytes object
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return orjson.loads(view)
+
+    @staticmethod
+    def _build_expiry_index(entries: Dict[str, Any]) -> Dict[str, int]:
+        """Read each entry's expires_at once; unreadable entries count as expired"""
+        index = {}
+        for key, entry in entries.items():
+            try:
+                index[key] = int(entry["expires_at"])
+            except Exception as e:
+                logger.warning(f"Invalid cache entry {key}: {e}, treating as expired")
+                index[key] = 0
+        return index
+
+    @staticmethod
+    def _empty_cache() -> Dict[str, Any]:
+        """Return cache data with no entries"""
+        return {"cache_version": CACHE_VERSION, "key_hash": KEY_HASH, "entries": {}}
+
+    def _save_cache(self) -> bool:
+        """
+        Save cache to JSON file
+        
+        The data is written to a temporary file beside the cache and moved over
+        it, so a crash mid-write leaves the previous cache intact instead of a
+        truncated file that would be discarded on the next load.
+        
+        Returns:
+            True if the cache file was written
+        """
+        tmp_path = self.cache_file_path.with_suffix(self.cache_file_path.suffix + ".tmp")
         try:
             # Create directory if it doesn't exist
             self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            with open(self.cache_file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.cache_data, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Cache saved with {len(self.cache_data.get('entries', {}))} entries")
+            data = _dumps(self.cache_data)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.cache_file_path)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Cache saved with %d entries", len(self.cache_data.get('entries', {})))
+            return True
         except Exception as e:
             logger.error(f"Failed to save cache file: {e}")
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            return False
+
+    def flush(self, force: bool = False) -> None:
+        """
+        Write pending changes to the cache file
+        
+        Args:
+            force: Write now even if flush_interval_seconds has not passed
+        """
+        if not self._dirty:
+            return
+        if not force and time.monotonic() - self._last_flush < self.flush_interval_seconds:
+            return
+        # Stay dirty if the write failed so the next flush retries it
+        if self._save_cache():
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        """Write any pending changes; call when done with the cache"""
+        self.flush(force=True)
 
     def _generate_cache_key(self, result: Dict[str, Any], search_settings: Any) -> str:
         """
@@ -75,56 +240,40 @@ class NotificationCache:
             search_settings: Search settings with date, direction, etc.
             
         Returns:
-            MD5 hash as cache key
+            xxh3_64 hex digest of the key components
         """
         # Extract key components
-        depart_date = search_settings.depart_date.isoformat()
+        depart_date = _iso(search_settings.depart_date)
         direction = search_settings.direction.value
         
-        # Sort trains by train number for consistent hashing
         available_trains = result.get("available_trains", [])
         return_trains = result.get("return_trains", [])
+        return_date = _iso(search_settings.return_date) if return_trains else None
         
-        # Determine directions
-        outbound_direction = search_settings.direction.value
-        return_direction = self._get_opposite_direction(search_settings.direction).value if return_trains else None
+        # Hash the components directly, one delimited line per train, rather than
+        # serializing a throwaway structure just to get bytes to hash
+        key_hash = _new_key_hash()
+        key_hash.update(f"{depart_date}|{direction}|{return_date}\n".encode('utf-8'))
         
-        # Create train signatures (train_number, departure_time, available_seats, direction)
-        train_signatures = []
-        
-        for train in sorted(available_trains, key=lambda t: t.get("train_number", "")):
-            train_signatures.append({
-                "train_number": train.get("train_number"),
-                "departure_time": train.get("departure_time"),
-                "available_seats": train.get("available_seats", 0),
-                "direction": outbound_direction
-            })
+        # The packed rows are fresh lists, so sort them in place
+        rows = _train_rows(available_trains, direction)
+        rows.sort(key=_by_train_number)
         
         # For round-trip, include return trains with their direction
         if return_trains:
-            return_date = search_settings.return_date.isoformat() if search_settings.return_date else None
-            for train in sorted(return_trains, key=lambda t: t.get("train_number", "")):
-                train_signatures.append({
-                    "train_number": train.get("train_number"),
-                    "departure_time": train.get("departure_time"),
-                    "available_seats": train.get("available_seats", 0),
-                    "direction": return_direction
-                })
-        else:
-            return_date = None
-        
-        # Create hashable string
-        key_data = {
-            "date": depart_date,
-            "direction": direction,
-            "return_date": return_date,
-            "trains": train_signatures
-        }
+            return_direction = _OPPOSITE_DIRECTION_VALUE[direction]
+            return_rows = _train_rows(return_trains, return_direction)
+            return_rows.sort(key=_by_train_number)
+            rows += return_rows
         
-        key_string = json.dumps(key_data, sort_keys=True)
-        cache_key = hashlib.md5(key_string.encode('utf-8')).hexdigest()
+        # Sorted by train number within each leg for consistent hashing. The
+        # lines are joined and encoded once, so the hash sees a single buffer
+        key_hash.update("".join(["%s|%s|%s|%s\n" % row for row in rows]).encode('utf-8'))
         
-        logger.debug(f"Generated cache key: {cache_key} for {depart_date} {direction}")
+        cache_key = key_hash.hexdigest()
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Generated cache key: %s for %s %s", cache_key, depart_date, direction)
         return cache_key
 
     def should_send_notification(self, result: Dict[str, Any], search_settings: Any) -> bool:
@@ -151,19 +300,26 @@ class NotificationCache:
             return False
         
         cache_key = self._generate_cache_key(result, search_settings)
+        self._ensure_loaded()
         
         # Check if this exact availability was already notified
-        if cache_key in self.cache_data["entries"]:
-            entry = self.cache_data["entries"][cache_key]
-            expires_at = datetime.fromisoformat(entry["expires_at"])
-            
-            if datetime.now() < expires_at:
-                logger.info(f"Cache hit: Already notified for this availability (expires at {expires_at})")
+        expires_at = self._expiry_index.get(cache_key)
+        if expires_at is not None:
+            if int(time.time()) < expires_at:
+                # Entries are kept in least- to most-recently-used order; the new
+                # order is written with the next change rather than on every hit
+                entries = self.cache_data["entries"]
+                entries[cache_key] = entries.pop(cache_key)
+                logger.info(
+                    f"Cache hit: Already notified for this availability "
+                    f"(expires at {datetime.fromtimestamp(expires_at).isoformat()})"
+                )
                 return False
             else:
                 logger.info(f"Cache expired: Will send notification again")
                 # Remove expired entry
                 del self.cache_data["entries"][cache_key]
+                del self._expiry_index[cache_key]
         
         logger.info(f"Cache miss: New availability detected, will send notification")
         return True
@@ -184,61 +340,61 @@ class NotificationCache:
         
         # Determine directions
         outbound_direction = search_settings.direction.value
-        return_direction = self._get_opposite_direction(search_settings.direction).value if return_trains else None
-        
-        trains_data = []
-        for train in available_trains:
-            trains_data.append({
-                "train_number": train.get("train_number"),
-                "departure_time": train.get("departure_time"),
-                "available_seats": train.get("available_seats", 0),
-                "direction": outbound_direction
-            })
-        
-        for train in return_trains:
-            trains_data.append({
-                "train_number": train.get("train_number"),
-                "departure_time": train.get("departure_time"),
-                "available_seats": train.get("available_seats", 0),
-                "direction": return_direction
-            })
-        
-        now = datetime.now()
-        expires_at = now + timedelta(hours=self.expiry_hours)
-        
-        # Store cache entry
-        self.cache_data["entries"][cache_key] = {
-            "date": search_settings.depart_date.isoformat(),
-            "direction": search_settings.direction.value,
-            "return_date": search_settings.return_date.isoformat() if search_settings.return_date else None,
+        return_direction = _OPPOSITE_DIRECTION_VALUE[outbound_direction] if return_trains else None
+        
+        # Stored as TRAIN_FIELDS rows (JSON arrays) rather than one dict per train
+        trains_data = _train_rows(available_trains, outbound_direction) + _train_rows(
+            return_trains, return_direction
+        )
+        
+        now = int(time.time())
+        expires_at = now + int(self.expiry_hours * 3600)
+        expires_at_iso = datetime.fromtimestamp(expires_at).isoformat()
+        
+        # Store cache entry, re-inserting so it becomes the most recently used
+        entries = self.cache_data["entries"]
+        entries.pop(cache_key, None)
+        entries[cache_key] = {
+            "date": _iso(search_settings.depart_date),
+            "direction": outbound_direction,
+            "return_date": _iso(search_settings.return_date),
             "trains": trains_data,
-            "notified_at": now.isoformat(),
-            "expires_at": expires_at.isoformat()
+            "notified_at": datetime.fromtimestamp(now).isoformat(),
+            "expires_at": expires_at,
+            # Readable copy of expires_at for anyone inspecting the file
+            "expires_at_iso": expires_at_iso
         }
+        self._expiry_index[cache_key] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, cache_key))
+        
+        # Evict the least recently used entries; their heap pairs go stale
+        while len(entries) > self.max_entries:
+            evicted_key = next(iter(entries))
+            del entries[evicted_key]
+            del self._expiry_index[evicted_key]
+            logger.debug("Evicted least recently used cache entry %s", evicted_key)
         
-        self._save_cache()
-        logger.info(f"Added to cache: {cache_key} (expires at {expires_at})")
+        self._dirty = True
+        self.flush()
+        logger.info(f"Added to cache: {cache_key} (expires at {expires_at_iso})")
 
     def cleanup_expired(self) -> None:
         """Remove expired cache entries"""
-        now = datetime.now()
+        self._ensure_loaded()
+        now = int(time.time())
         initial_count = len(self.cache_data["entries"])
         
-        # Find expired entries
+        # Pop expired entries off the heap, skipping stale pairs
         expired_keys = []
-        for key, entry in self.cache_data["entries"].items():
-            try:
-                expires_at = datetime.fromisoformat(entry["expires_at"])
-                if now >= expires_at:
-                    expired_keys.append(key)
-            except Exception as e:
-                logger.warning(f"Invalid cache entry {key}: {e}, removing")
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            if self._expiry_index.get(key) == expires_at:
+                del self.cache_data["entries"][key]
+                del self._expiry_index[key]
                 expired_keys.append(key)
         
-        # Remove expired entries
-        for key in expired_keys:
-            del self.cache_data["entries"][key]
-        
         if expired_keys:
-            self._save_cache()
+            self._dirty = True
+            self.flush()
             logger.info(f"Cleaned up {len(expired_keys)} expired cache entries ({initial_count} -> {len(self.cache_data['entries'])})")
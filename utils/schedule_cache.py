@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Schedule Cache Module
+Reuses recent scrape results for an identical search instead of reloading KTMB
+"""
+
+import os
+import copy
+import json
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleCache:
+    """Stores successful scrape results on disk for a short time-to-live"""
+
+    def __init__(self, cache_file_path: str = "./cache/schedule_cache.json", ttl_seconds: int = 300):
+        """
+        Initialize schedule cache
+
+        Args:
+            cache_file_path: Path to JSON cache file
+            ttl_seconds: Seconds a cached result stays valid (default: 300)
+        """
+        self.cache_file_path = Path(cache_file_path)
+        self.ttl_seconds = ttl_seconds
+        self.cache_data = self._load_cache()
+
+    def _load_cache(self) -> Dict[str, Any]:
+        """Load cache from JSON file"""
+        try:
+            if self.cache_file_path.exists():
+                with open(self.cache_file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                    logger.debug(f"Loaded schedule cache with {len(data.get('entries', {}))} entries")
+                    return data
+        except Exception as e:
+            logger.warning(f"Failed to load schedule cache file: {e}, creating new cache")
+        return {"cache_version": "1.0", "entries": {}}
+
+    def _save_cache(self) -> None:
+        """
+        Save cache to JSON file
+
+        Written to a temporary file beside the cache and moved over it, so a
+        crash mid-write leaves the previous cache intact.
+        """
+        tmp_path = self.cache_file_path.with_suffix(self.cache_file_path.suffix + ".tmp")
+        try:
+            # Create directory if it doesn't exist
+            self.cache_file_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.cache_data, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.cache_file_path)
+            logger.debug(f"Schedule cache saved with {len(self.cache_data.get('entries', {}))} entries")
+        except Exception as e:
+            logger.error(f"Failed to save schedule cache file: {e}")
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _generate_cache_key(search_settings: Any) -> str:
+        """
+        Generate cache key from everything that shapes a scrape result
+
+        Args:
+            search_settings: Search settings with date, direction, filters, etc.
+
+        Returns:
+            MD5 hash as cache key
+        """
+        key_data = {
+            "direction": search_settings.direction.value,
+            "depart_date": search_settings.depart_date.isoformat(),
+            "return_date": search_settings.return_date.isoformat() if search_settings.return_date else "",
+            "passengers": search_settings.total_pax,
+            "min_seats": search_settings.min_available_seats,
+            "max_seats": search_settings.max_available_seats,
+            "time_slots": sorted(slot.value for slot in search_settings.desired_time_slots),
+        }
+        key_string = json.dumps(key_data, sort_keys=True)
+        # Not a security use, which also keeps MD5 available on FIPS-enabled hosts
+        return hashlib.md5(key_string.encode('utf-8'), usedforsecurity=False).hexdigest()
+
+    def get(self, search_settings: Any) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached result for these settings, if it has not expired
+
+        Args:
+            search_settings: Search settings with date, direction, etc.
+
+        Returns:
+            A copy of the cached scrape result, or None on a miss
+        """
+        cache_key = self._generate_cache_key(search_settings)
+        entry = self.cache_data["entries"].get(cache_key)
+        if entry is None:
+            return None
+
+        try:
+            expires_at = datetime.fromisoformat(entry["expires_at"])
+        except Exception as e:
+            logger.warning(f"Invalid schedule cache entry {cache_key}: {e}, ignoring")
+            return None
+
+        if datetime.now() >= expires_at:
+            logger.debug(f"Schedule cache expired for {cache_key}")
+            return None
+
+        logger.info(f"Schedule cache hit: reusing result scraped at {entry['result'].get('scraped_at')}")
+        # Callers filter and annotate results in place, so never hand out the
+        # cached dict itself
+        return copy.deepcopy(entry["result"])
+
+    def set(self, search_settings: Any, result: Dict[str, Any]) -> None:
+        """
+        Store a scrape result and drop any expired entries
+
+        Args:
+            search_settings: Search settings the result was scraped with
+            result: Successful scrape result
+        """
+        now = datetime.now()
+        entries = self.cache_data["entries"]
+
+        # Remove expired entries so the file does not grow without bound
+        expired_keys = []
+        for key, entry in entries.items():
+            try:
+                if now >= datetime.fromisoformat(entry["expires_at"]):
+                    expired_keys.append(key)
+            except Exception:
+                expired_keys.append(key)
+        for key in expired_keys:
+            del entries[key]
+
+        entries[self._generate_cache_key(search_settings)] = {
+            "result": copy.deepcopy(result),
+            "expires_at": (now + timedelta(seconds=self.ttl_seconds)).isoformat(),
+        }
+        self._save_cache()